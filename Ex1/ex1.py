@@ -1,41 +1,46 @@
+import os
 import random
-import numpy as np
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from sortlib.merge import merge_sort_bottom_up, merge_sort_recursive
+
 
 def merge_sort(arr, low, high):
-    if low < high:
-        mid = (low + high) // 2
-        merge_sort(arr, low, mid)
-        merge_sort(arr, mid + 1, high)
-        merge(arr, low, mid, high)  
-
-def merge(arr, low, mid, high):
-    left_size = mid - low + 1
-    right_size = high - mid
-    
-    left_arr = arr[low:mid+1]
-    right_arr = arr[mid+1:high+1]
-    
-    i = j = 0  
-    k = low   
-    
-    while i < left_size and j < right_size:
-        if left_arr[i] <= right_arr[j]:
-            arr[k] = left_arr[i]
-            i += 1
-        else:
-            arr[k] = right_arr[j]
-            j += 1
-        k += 1
-    
-    while i < left_size:
-        arr[k] = left_arr[i]
-        i += 1
-        k += 1
-    
-    while j < right_size:
-        arr[k] = right_arr[j]
-        j += 1
-        k += 1
+    """Sorts arr[low..high] in place (bottom-up, single auxiliary buffer)."""
+    merge_sort_bottom_up(arr, low, high)
+
+
+def measure(sort_fn, base):
+    """Returns (seconds, peak bytes allocated) for sorting a copy of base."""
+    # timed and traced separately: tracemalloc slows every allocation down
+    arr = base[:]
+    t0 = time.perf_counter()
+    sort_fn(arr, 0, len(arr) - 1)
+    t1 = time.perf_counter()
+    assert arr == sorted(base)
+
+    arr = base[:]
+    tracemalloc.start()
+    sort_fn(arr, 0, len(arr) - 1)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return t1 - t0, peak
+
+
+def compare_implementations(sizes=(1000, 10000, 100000)):
+    """Reports peak memory and throughput of bottom-up vs recursive merge sort."""
+    rng = random.Random(338)
+    for n in sizes:
+        base = [rng.randint(0, n) for _ in range(n)]
+        for name, fn in [("recursive", merge_sort_recursive),
+                         ("bottom-up", merge_sort_bottom_up)]:
+            t, peak = measure(fn, base)
+            print(f"n={n:7d}  {name:9s}  time={t:.4f}s  "
+                  f"throughput={n / t:,.0f} elem/s  peak={peak / 1024:,.1f} KiB")
+
 
 def test_merge_sort():
     arr = [38, 27, 43, 3, 9, 82, 10]
@@ -49,4 +54,6 @@ def test_merge_sort():
     print(f"Sorted array: {test_arr}")
 
 if __name__ == "__main__":
-    test_merge_sort()
\ No newline at end of file
+    test_merge_sort()
+    print()
+    compare_implementations()
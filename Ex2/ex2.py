@@ -1,48 +1,16 @@
 import random
-import matplotlib.pyplot as plt 
-import numpy as np 
-import timeit
-import statistics   
 import sys
-import time
-
-sys.setrecursionlimit(1_000_000)
-
-def bubble_sort(arr):
-    n = len(arr)
-    for i in range(n):
-        for j in range(0, n-i-1):
-            if arr[j] > arr[j+1]:
-                temp = arr[j]
-                arr[j] = arr[j+1]
-                arr[j+1] = temp
-    return arr
-
-
-def partition(arr, low, high):
-
-    pivot = arr[high]
-    i = low-1
-
-    for j in range(low, high):
-        if arr[j] < pivot:
-            i+=1
-            arr[i], arr[j] = arr[j], arr[i]
-    arr[i+1], arr[high] = arr[high], arr[i+1]
-
-    return i+1
-
-def quicksort(arr, low=0, high=None):
-    if high is None:
-        high = len(arr) - 1
-
-    if low<high:
-        p = partition(arr, low, high)
-        quicksort(arr, low, p-1)
-        quicksort(arr, p+1, high)
-
-    return arr
-
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from sortlib.bench import report
+from sortlib.bench.calibrate import calibrate
+from sortlib.bench.parallel import run_parallel
+from sortlib.bench.store import ResultStore, input_digest
+from sortlib.bench.timing import measure
+from sortlib.hybrid import save_thresholds
+from sortlib.quick import quicksort
+from sortlib.simple import bubble_sort
 
 def make_sorted(n):
     return list(range(n))
@@ -56,14 +24,18 @@ def make_random(n, rng):
     return arr
 
 def time_one(sort_fn, base_arr, repeats=7):
-    times = []
-    for _ in range(repeats):
-        arr = base_arr[:]  # IMPORTANT: copy each time
-        t0 = time.perf_counter()
-        sort_fn(arr)
-        t1 = time.perf_counter()
-        times.append(t1 - t0)
-    return statistics.median(times)
+    """
+    Median time of sort_fn on a fresh copy of base_arr (the copy is made
+    outside the timed region). At least `repeats` samples are taken, more
+    while the median's confidence interval is still wide.
+    """
+    stats = measure(sort_fn, setup=lambda: (base_arr[:],), min_repeats=repeats)
+    return stats["median"]
+
+def cell_key(sort_fn, scen_name, base, repeats, seed):
+    """Arguments identifying one timed cell in a ResultStore."""
+    return dict(algorithm=sort_fn, generator=scen_name, n=len(base), seed=seed,
+                params={"repeats": repeats}, input_hash=input_digest(base))
 
 def find_crossover(sizes, bubble_times, quick_times):
     # first n where quick < bubble
@@ -73,7 +45,11 @@ def find_crossover(sizes, bubble_times, quick_times):
     return None
 
 
-def run_experiment(sizes, repeats=7, seed=123):
+def run_experiment(sizes, repeats=7, seed=123, store=None):
+    """
+    Times bubble sort and quicksort on every (scenario, n). With a
+    ResultStore, cells measured on an earlier run are read back instead.
+    """
     rng = random.Random(seed)
 
     scenarios = {
@@ -91,8 +67,14 @@ def run_experiment(sizes, repeats=7, seed=123):
         for scen_name, gen in scenarios.items():
             base = gen(n)
 
-            tb = time_one(bubble_sort, base, repeats=repeats)
-            tq = time_one(quicksort, base, repeats=repeats)
+            if store is None:
+                tb = time_one(bubble_sort, base, repeats=repeats)
+                tq = time_one(quicksort, base, repeats=repeats)
+            else:
+                tb = store.cached(measure=lambda: time_one(bubble_sort, base, repeats=repeats),
+                                  **cell_key(bubble_sort, scen_name, base, repeats, seed))
+                tq = store.cached(measure=lambda: time_one(quicksort, base, repeats=repeats),
+                                  **cell_key(quicksort, scen_name, base, repeats, seed))
 
             results["bubble"][scen_name].append(tb)
             results["quick"][scen_name].append(tq)
@@ -101,7 +83,63 @@ def run_experiment(sizes, repeats=7, seed=123):
 
     return results
 
+
+def run_experiment_parallel(sizes, repeats=7, seed=123, max_workers=None, store=None):
+    """
+    Same grid and inputs as run_experiment, but every (algorithm, scenario, n)
+    cell is timed in its own pinned worker process. Returns the same
+    results[algo][scenario] lists. Cells already in store are not re-timed.
+    """
+    rng = random.Random(seed)
+
+    scenarios = {
+        "sorted": make_sorted,
+        "reverse": make_reverse,
+        "random": lambda n: make_random(n, rng)
+    }
+    algos = {"bubble": bubble_sort, "quick": quicksort}
+
+    # inputs are generated here, in run_experiment's order, so the random
+    # scenario sees the exact same arrays
+    tasks = []
+    timings = {}
+    keys = {}
+    for i, n in enumerate(sizes):
+        for scen_name, gen in scenarios.items():
+            base = gen(n)
+            for algo, fn in algos.items():
+                cell = (algo, scen_name, i)
+                if store is not None:
+                    keys[cell] = cell_key(fn, scen_name, base, repeats, seed)
+                    cached = store.get(**keys[cell])
+                    if cached is not None:
+                        timings[cell] = cached
+                        continue
+                tasks.append((cell, time_one, (fn, base, repeats)))
+
+    # largest (slowest) cells first so no worker is left with a long tail
+    tasks.sort(key=lambda t: sizes[t[0][2]], reverse=True)
+    if tasks:
+        measured = run_parallel(tasks, max_workers=max_workers)
+        timings.update(measured)
+        if store is not None:
+            for cell, t in measured.items():
+                store.put(value=t, **keys[cell])
+
+    results = {algo: {k: [] for k in scenarios} for algo in algos}
+    for i, n in enumerate(sizes):
+        for scen_name in scenarios:
+            tb = timings[("bubble", scen_name, i)]
+            tq = timings[("quick", scen_name, i)]
+            results["bubble"][scen_name].append(tb)
+            results["quick"][scen_name].append(tq)
+            print(f"n={n:5d}  {scen_name:7s}  bubble={tb:.6f}s  quick={tq:.6f}s")
+
+    return results
+
 def plot_results(sizes, results, logy=False):
+    plt = report.pyplot()
+
     for scen in ["sorted", "reverse", "random"]:
         plt.figure()
         plt.plot(sizes, results["bubble"][scen], marker="o", label="Bubble sort")
@@ -114,35 +152,47 @@ def plot_results(sizes, results, logy=False):
         plt.grid(True)
         plt.legend()
         plt.tight_layout()
-        plt.show()
+        report.show(scen)
+
+if __name__ == "__main__":
+    sizes = [10, 20, 30, 45, 70, 100, 150, 220, 330, 500,
+             750, 1000, 1300, 1700, 2200, 2800, 3500, 4300, 5200, 6200]
 
-sizes = [10, 20, 30, 45, 70, 100, 150, 220, 330, 500,
-         750, 1000, 1300, 1700, 2200, 2800, 3500, 4300, 5200, 6200]
+    results = run_experiment_parallel(sizes, repeats=7, seed=123, store=ResultStore())
 
-results = run_experiment(sizes, repeats=7, seed=123)
+    # Crossover thresholds (small vs not small)
+    crossovers = {}
+    for scen in ["sorted", "reverse", "random"]:
+        n0 = find_crossover(sizes, results["bubble"][scen], results["quick"][scen])
+        crossovers[scen] = n0
+        print(f"Crossover (quicksort faster) for {scen}: {n0}")
+    report.note("Crossover n (quicksort faster than bubble sort)", crossovers)
 
-# Crossover thresholds (small vs not small)
-for scen in ["sorted", "reverse", "random"]:
-    n0 = find_crossover(sizes, results["bubble"][scen], results["quick"][scen])
-    print(f"Crossover (quicksort faster) for {scen}: {n0}")
+    # regenerate the switch points sortlib.hybrid_sort uses on this machine
+    thresholds, measurements = calibrate()
+    measurements["bubble_vs_quick_crossover"] = crossovers
+    save_thresholds(thresholds, measurements)
+    report.note("Hybrid sort thresholds", thresholds)
 
-plot_results(sizes, results, logy=True)
+    plot_results(sizes, results, logy=True)
 
 
 # - Bubble sort (no early exit):
 #     Best case (sorted) is still Θ(n^2) comparisons (but fewer swaps).
 #      Worst case (reverse) is Θ(n^2) comparisons + many swaps.
 #      Average case (random) is Θ(n^2).
-# - Quicksort here is Lomuto partition with LAST element pivot:
-#      Worst case: sorted and reverse -> Θ(n^2) due to unbalanced partitions.
+# - Quicksort here is the shared introsort in sortlib.quick (median-of-three
+#   pivot, Hoare partition, heapsort fallback):
+#      Sorted and reverse inputs now pick the true median as pivot -> Θ(n log n).
 #      Average case: random -> Θ(n log n).
-#      Best case: perfectly balanced splits (theoretical), not guaranteed by last-pivot.
+#      Worst case is capped at Θ(n log n) by the heapsort fallback.
 #
-# measured results showed 
+# measured results with the original Lomuto last-element pivot showed
 # - Random: quicksort becomes faster very early (n≈10 in run).
 # - Reverse: quicksort becomes faster around n≈20 in run.
 # - Sorted: quicksort never became faster in your tested range because
 #          last-pivot quicksort hits worst-case and has recursion overhead.
+#   With the introsort engine the sorted case no longer has that cliff.
 #
 
 
@@ -1,6 +1,12 @@
+import os
 import random
-import matplotlib.pyplot as plt
-import numpy as np
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from sortlib.bench import report
+from sortlib.bench.store import ResultStore, input_digest
+from sortlib.inversions import bubble_stats
+from sortlib.simple import bubble_sort_with_counts
 
 # 1. Complexity Analysis Formulas:
 # For bubble sort on n elements:
@@ -11,33 +17,44 @@ import numpy as np
 #4 The number of comparisons matches the theoretical formula n(n-1)/2 for all input sizes. It shows that the bubble sort always does the same 
 # amount of comparisons despite the input order. However the swap counts are close but not identical to the theoretical predictions. 
 # The statistical version was the most accurate to an average case because we used a randomly filled array.
+#
+# The swap count is exactly the number of inversions in the input and the comparison count is
+# n(n-1)/2, so the analytic mode (sortlib.inversions.bubble_stats) gets the same numbers in
+# O(n log n) without running bubble sort, which takes the check up to n=10^7. At that size the
+# ratio settles at ~0.999 rather than 1: equal values are never swapped, and with values drawn
+# from 1..1000 a random pair is equal 1 time in 1000.
 
-def bubble_sort_with_counts(arr):
-    """Bubble sort that counts comparisons and swaps"""
-    n = len(arr)
-    comparisons = 0
-    swaps = 0
-    
-    arr_copy = arr.copy()
-    
-    for i in range(n):
-        for j in range(0, n-i-1):
-            comparisons += 1
-            if arr_copy[j] > arr_copy[j+1]:
-                arr_copy[j], arr_copy[j+1] = arr_copy[j+1], arr_copy[j]
-                swaps += 1
-    
-    return arr_copy, comparisons, swaps
+SIZES = [10, 20, 30, 40, 50, 75, 100, 150, 200]
+ANALYTIC_SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+def count_cell(arr, analytic=False):
+    if analytic:
+        stats = bubble_stats(arr)
+        return [stats["comparisons"], stats["swaps"]]
+    _, comparisons, swaps = bubble_sort_with_counts(arr)
+    return [comparisons, swaps]
 
-def run_experiments():
-    """Run bubble sort on inputs of increasing size"""
-    sizes = [10, 20, 30, 40, 50, 75, 100, 150, 200]
+def run_experiments(seed=None, store=None, sizes=SIZES, analytic=False):
+    """Run bubble sort (or count what it would do, if analytic) on inputs of increasing size"""
     results = []
+    rng = random.Random(seed)
     
     for n in sizes:
-        arr = [random.randint(1, 1000) for _ in range(n)]
+        if analytic:
+            # one generator per size, so each input is fixed by (seed, n) alone
+            arr = random.Random(None if seed is None else f"{seed}:{n}").choices(range(1, 1001), k=n)
+        else:
+            arr = [rng.randint(1, 1000) for _ in range(n)]
         
-        sorted_arr, comparisons, swaps = bubble_sort_with_counts(arr)
+        if store is None:
+            comparisons, swaps = count_cell(arr, analytic)
+        elif analytic:
+            comparisons, swaps = store.cached(bubble_stats, "choices(1..1000)", n,
+                                              lambda: count_cell(arr, analytic=True), seed=seed)
+        else:
+            comparisons, swaps = store.cached(bubble_sort_with_counts, "randint(1,1000)", n,
+                                              lambda: count_cell(arr), seed=seed,
+                                              input_hash=input_digest(arr))
         
         results.append({
             'n': n,
@@ -49,8 +66,10 @@ def run_experiments():
     
     return results
 
-def plot_results(results):
-    """Plot comparison and swap counts"""
+def plot_results(results, name="counts", log=False):
+    """Plot comparison and swap counts (on log-log axes if log)"""
+    plt = report.pyplot()
+
     n_values = [r['n'] for r in results]
     comparisons = [r['comparisons'] for r in results]
     swaps = [r['swaps'] for r in results]
@@ -76,8 +95,13 @@ def plot_results(results):
     ax2.legend()
     ax2.grid(True, alpha=0.3)
     
+    if log:
+        for ax in (ax1, ax2):
+            ax.set_xscale('log')
+            ax.set_yscale('log')
+    
     plt.tight_layout()
-    plt.show()
+    report.show(name)
     
     print("\n=== Complexity Analysis ===")
     print("1. Comparisons formula: n*(n-1)/2")
@@ -94,11 +118,14 @@ def plot_results(results):
 if __name__ == "__main__":
     print("Running bubble sort complexity analysis...\n")
     
-    results = run_experiments()
+    store = ResultStore()
+    results = run_experiments(seed=338, store=store)
     
     plot_results(results)
     
     print("\n=== Verification ===")
+    report.note("Swaps ratio vs n(n-1)/4",
+                {r['n']: round(r['swaps'] / (r['n'] * (r['n'] - 1) / 4), 3) for r in results})
     for r in results:
         n = r['n']
         actual_comparisons = r['comparisons']
@@ -109,4 +136,23 @@ if __name__ == "__main__":
         print(f"n={n}:")
         print(f"  Comparisons: actual={actual_comparisons}, theoretical={theoretical_comparisons:.0f}")
         print(f"  Swaps: actual={actual_swaps}, theoretical={theoretical_swaps:.0f}")
-        print(f"  Swaps ratio: {actual_swaps/theoretical_swaps:.2f} (expected ~1.0)")
\ No newline at end of file
+        print(f"  Swaps ratio: {actual_swaps/theoretical_swaps:.2f} (expected ~1.0)")
+    
+    print("\n=== Analytic mode (inversion counting) ===")
+    check = [random.Random(338).randint(1, 1000) for _ in range(200)]
+    print(f"Analytic counts match simulation at n=200: {count_cell(check, analytic=True) == count_cell(check)}")
+    
+    analytic = run_experiments(seed=338, store=store, sizes=ANALYTIC_SIZES, analytic=True)
+    plot_results(analytic, name="counts_analytic", log=True)
+    report.note("Swaps ratio vs n(n-1)/4 (analytic)",
+                {r['n']: round(r['swaps'] / (r['n'] * (r['n'] - 1) / 4), 4) for r in analytic})
+    for r in analytic:
+        print(f"n={r['n']}: swaps ratio {r['swaps'] / (r['n'] * (r['n'] - 1) / 4):.4f} (expected ~1.0)")
+    
+    # swaps per pass: pass k swaps every element with at least k larger elements before it
+    n = 10**5
+    stats = bubble_stats(random.Random("338:passes").choices(range(1, 1001), k=n), per_pass=True)
+    first = stats["pass_swaps"][:3]
+    print(f"n={n}: sorted after {stats['passes']} of {n} passes, first passes swap {first}")
+    report.note("Bubble sort passes (analytic)", {"n": n, "passes until sorted": stats["passes"],
+                                                  "swaps in first 3 passes": first})
\ No newline at end of file
@@ -8,62 +8,48 @@ array_example = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16]
 
 # then using the quicksort algoithm assuming we always chose the pivot to be the
 # element we get the worst time complexity 
+#
+# The quicksort timed below is the shared introsort from sortlib.quick, which
+# takes a median-of-three pivot (and falls back to heapsort past 2*log2(n)
+# depth), so this sorted input no longer triggers the O(n^2) case.
 
-import time
-import statistics
 import sys
+import os
 import numpy as np
-import matplotlib.pyplot as plt
-def partition(arr, low, high):
 
-    pivot = arr[high]
-    i = low-1
-
-    for j in range(low, high):
-        if arr[j] < pivot:
-            i+=1
-            arr[i], arr[j] = arr[j], arr[i]
-    arr[i+1], arr[high] = arr[high], arr[i+1]
-
-    return i+1
-
-def quicksort(arr, low=0, high=None):
-    if high is None:
-        high = len(arr) - 1
-
-    if low<high:
-        p = partition(arr, low, high)
-        quicksort(arr, low, p-1)
-        quicksort(arr, p+1, high)
-
-    return arr
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from sortlib.bench import report
+from sortlib.bench.fit import check, fit
+from sortlib.bench.store import ResultStore
+from sortlib.bench.sweep import adaptive_sweep
+from sortlib.bench.timing import measure
+from sortlib.quick import quicksort
 
 
 def time_quicksort_on_sorted(n, repeats=7):
-    base = list(range(1, n + 1))  # ascending worst-case input
-    times = []
-    for _ in range(repeats):
-        arr = base[:]  
-        t0 = time.perf_counter()
-        quicksort(arr)
-        t1 = time.perf_counter()
-        times.append(t1 - t0)
-    return statistics.median(times)
+    base = list(range(1, n + 1))  # ascending (worst case for last-element pivot)
+    # small budget per n and no bootstrap: the sweep measures a few hundred
+    # sizes and only the median is used
+    stats = measure(quicksort, setup=lambda: (base[:],), min_repeats=repeats,
+                    max_time=0.02, n_boot=0)
+    return stats["median"]
 
 start_n = 16
-max_n = 2000     
-step = 1         
+max_n = 2000
 
-sizes = list(range(start_n, max_n + 1, step))
+# cells from earlier (or interrupted) runs with unchanged quicksort code are reused
+store = ResultStore()
 
-sys.setrecursionlimit(max_n + 1000)
+def timed(n):
+    return store.cached(quicksort, "ascending", n, lambda: time_quicksort_on_sorted(n, repeats=5),
+                        params={"repeats": 5})
 
-times = []
-for n in sizes:
-    t = time_quicksort_on_sorted(n, repeats=5) 
-    times.append(t)
-    if n % 100 == 0:
-        print(f"n={n}  time={t:.6f}s")
+# instead of every n from 16 to 2000, a geometric grid refined where the
+# fitted model misses or the grid is coarse (~200 sizes instead of ~2000)
+sweep = adaptive_sweep(timed, start_n, max_n, budget=30.0)
+sizes, times = sweep["sizes"], sweep["series"]["time"]
+print(f"{len(sizes)} sizes measured between n={start_n} and n={max_n}")
+report.note("Sweep", {"sizes measured": len(sizes), "range": f"{start_n}..{max_n}"})
 
 sizes_np = np.array(sizes, dtype=float)
 times_np = np.array(times, dtype=float)
@@ -82,19 +68,39 @@ fit_nlogn = c_nlogn * nlogn
 print("Fit constants:")
 print("  time ≈ c*n^2      c =", c_n2)
 print("  time ≈ c*n*log2 n c =", c_nlogn)
-
-
+report.note("Fit constants", {"c (c*n^2)": c_n2, "c (c*n*log2 n)": c_nlogn})
+
+# every candidate model with an intercept, ranked by AIC, plus the log-log
+# exponent; flags the sweep if it no longer looks like n log n
+models = fit(sizes_np, times_np)
+exp = models["exponent"]
+drift = check(sizes_np, times_np, expected="n log n")["drift"]
+print(f"Best model by AIC: {models['best']} (cross-validation agrees: "
+      f"{fit(sizes_np, times_np, criterion='cv')['best'] == models['best']})")
+print(f"log-log exponent: {exp['exponent']:.3f}  95% CI [{exp['ci_low']:.3f}, {exp['ci_high']:.3f}]")
+if drift:
+    print("WARNING: quicksort on sorted input grows faster than n log n")
+report.note("Model selection", {
+    "best (AIC)": models["best"],
+    "log-log exponent": f"{exp['exponent']:.3f} [{exp['ci_low']:.3f}, {exp['ci_high']:.3f}]",
+    "faster than n log n": drift,
+    **{f"AIC {name}": m["aic"] for name, m in models["models"].items()},
+})
+
+
+plt = report.pyplot()
 plt.figure()
-plt.plot(sizes_np, times_np, marker="o", markersize=2, label="Measured worst-case time (sorted input)")
+plt.plot(sizes_np, times_np, marker="o", markersize=2, label="Measured time (sorted input)")
 plt.plot(sizes_np, fit_n2, label="Best fit: c·n²")
 plt.plot(sizes_np, fit_nlogn, label="Best fit: c·n·log₂(n)")
 plt.xlabel("Input size (n)")
 plt.ylabel("Time (seconds)")
-plt.title("Quicksort worst-case timing (last-element pivot, sorted input)")
+plt.title("Quicksort timing on sorted input (median-of-three introsort)")
 plt.grid(True)
 plt.legend()
 plt.tight_layout()
-plt.show()
+report.show("fit")
 
 
-# Results match complexity analysis- can see if program ids run a parabolic graph is produced
\ No newline at end of file
+# Results match complexity analysis- with the original last-element pivot a parabolic
+# graph was produced; with the introsort engine the c·n·log₂(n) fit is the close one
\ No newline at end of file
@@ -1,76 +1,84 @@
+import os
 import random
-import time
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-
-def insertion_sort(arr):
-    a = arr.copy()
-    for i in range(1, len(a)):
-        key = a[i]
-        j = i - 1
-        while j >= 0 and a[j] > key:
-            a[j + 1] = a[j]
-            j -= 1
-        a[j + 1] = key
-    return a
-
-def binary_search(a, key, low, high):
-    while low < high:
-        mid = (low + high) // 2
-        if a[mid] < key:
-            low = mid + 1
-        else:
-            high = mid
-    return low
-
-
-def binary_insertion_sort(arr):
-    a = arr.copy()
-    for i in range(1, len(a)):
-        key = a[i]
-        pos = binary_search(a, key, 0, i)
-        a[pos+1:i+1] = a[pos:i]
-        a[pos] = key
-    return a
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from sortlib.bench import report
+from sortlib.bench.store import ResultStore
+from sortlib.bench.timing import measure as measure_stats
+from sortlib.counting import count
+from sortlib.simple import binary_insertion_sort, block_insertion_sort, insertion_sort
 
 def measure(sort_func, arr):
-    start = time.perf_counter()
-    sort_func(arr)
-    end = time.perf_counter()
-    return end - start
+    # each call sorts a fresh copy in place; the copy is made outside the timed region
+    return measure_stats(sort_func, setup=lambda: (arr[:],), min_repeats=3,
+                         max_time=0.1)["median"]
+
+def average_time(sort_func, n, runs, seed):
+    # a per-n generator so both sorts see the same arrays and a cell can be
+    # re-measured on its own
+    rng = random.Random(f"{seed}:{n}")
+    total = 0
+    for _ in range(runs):
+        arr = rng.sample(range(n*10), n)
+        total += measure(sort_func, arr)
+    return total / runs
 
 sizes = [10, 20, 50, 100, 200, 500, 1000]
 runs = 20
+seed = 338
 
+store = ResultStore()
 ins_times = []
 bin_ins_times = []
+block_times = []
 
 for n in sizes:
-    t1 = 0
-    t2 = 0
-    for _ in range(runs):
-        arr = random.sample(range(n*10), n)
-        t1 += measure(insertion_sort, arr)
-        t2 += measure(binary_insertion_sort, arr)
-
-    ins_times.append(t1 / runs)
-    bin_ins_times.append(t2 / runs)
-
+    for sort_func, out in [(insertion_sort, ins_times), (binary_insertion_sort, bin_ins_times),
+                           (block_insertion_sort, block_times)]:
+        out.append(store.cached(sort_func, "sample(range(10n))", n,
+                                lambda: average_time(sort_func, n, runs, seed),
+                                seed=seed, params={"runs": runs}))
+
+# Operation counts behind the discussion below: comparisons should grow like
+# n log n for binary insertion sort, moves like n^2 for both.
+count_rng = random.Random(seed)
+print(f"{'n':>6} {'ins cmp':>10} {'bin cmp':>10} {'ins moves':>10} {'bin moves':>10}")
+op_counts = {}
+for n in sizes:
+    arr = count_rng.sample(range(n*10), n)
+    _, ins = count(insertion_sort, arr)
+    _, bins = count(binary_insertion_sort, arr)
+    print(f"{n:>6} {ins['comparisons']:>10} {bins['comparisons']:>10} {ins['moves']:>10} {bins['moves']:>10}")
+    op_counts[n] = (f"comparisons {ins['comparisons']} vs {bins['comparisons']}, "
+                    f"moves {ins['moves']} vs {bins['moves']}")
+report.note("Operation counts (insertion vs binary insertion)", op_counts)
+
+plt = report.pyplot()
 plt.plot(sizes, ins_times, 'o-', label="Insertion Sort")
 plt.plot(sizes, bin_ins_times, 'o-', label="Binary Insertion Sort")
+plt.plot(sizes, block_times, 'o-', label="Block Binary Insertion Sort")
 
 # Interpolating curves
 p1 = np.polyfit(sizes, ins_times, 2)
 p2 = np.polyfit(sizes, bin_ins_times, 2)
+p3 = np.polyfit(sizes, block_times, 2)
+report.note("Quadratic fit a*n^2 + b*n + c", {
+    "insertion": ", ".join(f"{c:.3e}" for c in p1),
+    "binary insertion": ", ".join(f"{c:.3e}" for c in p2),
+    "block binary insertion": ", ".join(f"{c:.3e}" for c in p3),
+})
 
 plt.plot(sizes, np.polyval(p1, sizes), '--')
 plt.plot(sizes, np.polyval(p2, sizes), '--')
+plt.plot(sizes, np.polyval(p3, sizes), '--')
 
 plt.xlabel("Input size (n)")
 plt.ylabel("Time (seconds)")
 plt.legend()
 plt.title("Insertion Sort vs Binary Insertion Sort")
-plt.show()
+report.show("insertion")
 
 """
 Discussion:
@@ -82,6 +90,12 @@ However, both algorithms still require O(n^2) shifts in the worst and average
 case, which is why the overall improvement is limited. The benefit comes
 purely from fewer comparisons, not fewer moves.
 
+The block variant (sortlib.simple.block_insertion_sort) still moves O(n^2)
+elements, but each insert shifts its whole block with one slice assignment
+instead of one interpreted step per element, so the quadratic term is paid
+at C speed. That is what makes it usable as the small-run kernel inside
+merge_sort.
+
 This explains why Python’s Timsort uses binary insertion sort only on
 small sub-arrays.
 """
@@ -1,104 +1,102 @@
 import random
 import time
-import matplotlib.pyplot as plt
+import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from sortlib.bench import report
+from sortlib.bench.store import ResultStore
+from sortlib.buffers import copy_of
+from sortlib.bench.timing import summarize, time_call
+from sortlib.index import make_lookup
+from sortlib.quick import quicksort
+from sortlib.search import binary_search, linear_search
 
 
-def linear_search(arr, target):
-    for v in arr:
-        if v == target:
-            return True
-    return False
+def sort_then_binary_search(arr, target, copy=False):
+    # every task gets a freshly shuffled/built arr, so by default it is
+    # sorted in place rather than copied first
+    if copy:
+        arr = copy_of(arr)
+    quicksort(arr)
+    return binary_search(arr, target)
 
 
-def binary_search(arr, target):
-    lo, hi = 0, len(arr) - 1
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        if arr[mid] == target:
-            return True
-        if arr[mid] < target:
-            lo = mid + 1
-        else:
-            hi = mid - 1
-    return False
-
-def partition(a, low, high):
-    pivot = a[high]  # last element pivot
-    i = low - 1
-    for j in range(low, high):
-        if a[j] <= pivot:
-            i += 1
-            a[i], a[j] = a[j], a[i]
-    a[i + 1], a[high] = a[high], a[i + 1]
-    return i + 1
-
-
-def quicksort(a, low=0, high=None):
-    if high is None:
-        high = len(a) - 1
-    if low < high:
-        p = partition(a, low, high)
-        quicksort(a, low, p - 1)
-        quicksort(a, p + 1, high)
-
+def measure_size(n, tasks, rng):
+    """
+    Median (linear, sort+binary, planned) time per task for one n, after
+    outlier rejection; the planned index's build time is spread over the tasks.
+    """
+    base = list(range(n))
+    target = n // 2  # constant element that is guaranteed to exist
 
+    lin, sortbin, planned = [], [], []
 
-def sort_then_binary_search(arr, target):
-    a = arr.copy()
-    quicksort(a)
-    return binary_search(a, target)
+    t0 = time.perf_counter()
+    lookup = make_lookup(base, tasks, cache="lru")
+    build = time.perf_counter() - t0
 
+    for _ in range(tasks):
+        rng.shuffle(base)  # reshuffle every time (per lab requirement)
+        lin.append(time_call(linear_search, base, target))
+        sortbin.append(time_call(sort_then_binary_search, base, target))
+        planned.append(time_call(lookup, target))
 
-def time_one(fn, arr, target):
-    t0 = time.perf_counter()
-    fn(arr, target)
-    t1 = time.perf_counter()
-    return t1 - t0
+    return [summarize(lin)["median"], summarize(sortbin)["median"],
+            summarize(planned)["median"] + build / tasks]
 
 
-def run_experiment(sizes, tasks=100):
+def run_experiment(sizes, tasks=100, seed=None, store=None):
     """
     For each n:
       - start from a base array of size n
       - for each task: reshuffle the array, search for a constant element
+    The planned series lets plan_lookups() choose between a linear scan and a
+    SortedIndex built once per n (reshuffling does not change the contents,
+    so the index stays valid across tasks); its build time is spread over the tasks.
+    With a ResultStore, sizes measured on an earlier run are read back.
     """
     lin_times = []
     sortbin_times = []
+    planned_times = []
 
     for n in sizes:
-        base = list(range(n))
-        target = n // 2  # constant element that is guaranteed to exist
-
-        t_lin = 0.0
-        t_sortbin = 0.0
+        rng = random.Random(None if seed is None else f"{seed}:{n}")
+        if store is None:
+            t_lin, t_sortbin, t_planned = measure_size(n, tasks, rng)
+        else:
+            t_lin, t_sortbin, t_planned = store.cached(
+                (linear_search, sort_then_binary_search, make_lookup), "shuffled range(n)", n,
+                lambda: measure_size(n, tasks, rng), seed=seed, params={"tasks": tasks})
 
-        for _ in range(tasks):
-            random.shuffle(base)  # reshuffle every time (per lab requirement)
-            t_lin += time_one(lambda a, x: linear_search(a, x), base, target)
-            t_sortbin += time_one(lambda a, x: sort_then_binary_search(a, x), base, target)
+        lin_times.append(t_lin)
+        sortbin_times.append(t_sortbin)
+        planned_times.append(t_planned)
 
-        lin_times.append(t_lin / tasks)
-        sortbin_times.append(t_sortbin / tasks)
+    return lin_times, sortbin_times, planned_times
 
-    return lin_times, sortbin_times
 
+def plot_results(sizes, lin_times, sortbin_times, title, planned_times=None):
+    plt = report.pyplot()
 
-def plot_results(sizes, lin_times, sortbin_times, title):
     plt.plot(sizes, lin_times, "o-", label="Linear search")
     plt.plot(sizes, sortbin_times, "o-", label="Quicksort + binary search")
+    if planned_times is not None:
+        plt.plot(sizes, planned_times, "o-", label="Planned (linear or index built once, LRU result cache)")
     plt.xlabel("Input size (n)")
-    plt.ylabel("Avg time per task (seconds)")
+    plt.ylabel("Median time per task (seconds)")
     plt.title(title)
     plt.legend()
     plt.xscale("log")  # helps readability across huge n range
-    plt.show()
+    report.show("search")
 
 
 if __name__ == "__main__":
     sizes = [10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
-    lin_times, sortbin_times = run_experiment(sizes, tasks=100)
-    plot_results(sizes, lin_times, sortbin_times, "Exercise 6 (Average-ish case)")
+    lin_times, sortbin_times, planned_times = run_experiment(sizes, tasks=100, seed=338,
+                                                             store=ResultStore())
+    plot_results(sizes, lin_times, sortbin_times, "Exercise 6 (Average-ish case)",
+                 planned_times=planned_times)
 
     """
     Discussion (put your answer here as comments):
@@ -106,4 +104,9 @@ if __name__ == "__main__":
     - As n grows, quicksort+binary may still lose if you sort every single time.
     - In THIS setup, because the array is reshuffled each task, you re-pay the sort cost each task.
       That usually makes linear search win for most sizes, unless you reuse the sorted array.
+    - The planned series does reuse it: once tasks * n outweighs n log n the planner
+      builds a SortedIndex once and each task is an O(log n) lookup.
+      Its results also go through an LRU cache (sortlib.cache); every task asks
+      for the same n // 2, so after the first task that is a dict hit and the
+      planned line flattens out.
     """
\ No newline at end of file
@@ -1,107 +1,105 @@
 import time
-import matplotlib.pyplot as plt
+import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from sortlib.bench import report
+from sortlib.bench.store import ResultStore
+from sortlib.buffers import copy_of
+from sortlib.bench.timing import summarize, time_call
+from sortlib.index import make_lookup
+from sortlib.quick import quicksort
+from sortlib.search import binary_search, linear_search
 
 
-def linear_search(arr, target):
-    for v in arr:
-        if v == target:
-            return True
-    return False
+def sort_then_binary_search(arr, target, copy=False):
+    # every task gets a freshly shuffled/built arr, so by default it is
+    # sorted in place rather than copied first
+    if copy:
+        arr = copy_of(arr)
+    quicksort(arr)
+    return binary_search(arr, target)
 
 
-def binary_search(arr, target):
-    lo, hi = 0, len(arr) - 1
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        if arr[mid] == target:
-            return True
-        if arr[mid] < target:
-            lo = mid + 1
-        else:
-            hi = mid - 1
-    return False
-
-
-
-
-def partition(a, low, high):
-    pivot = a[high]
-    i = low - 1
-    for j in range(low, high):
-        if a[j] <= pivot:
-            i += 1
-            a[i], a[j] = a[j], a[i]
-    a[i + 1], a[high] = a[high], a[i + 1]
-    return i + 1
-
-
-def quicksort(a, low=0, high=None):
-    if high is None:
-        high = len(a) - 1
-    if low < high:
-        p = partition(a, low, high)
-        quicksort(a, low, p - 1)
-        quicksort(a, p + 1, high)
-
+def measure_size(n, tasks):
+    """
+    Median (linear, sort+binary, planned) time per task for one n, after
+    outlier rejection; the planned index's build time is spread over the tasks.
+    """
+    target = n // 2
+    lin, sortbin, planned = [], [], []
 
-def sort_then_binary_search(arr, target):
-    a = arr.copy()
-    quicksort(a)
-    return binary_search(a, target)
+    t0 = time.perf_counter()
+    lookup = make_lookup(list(range(n)), tasks, cache="lru")
+    build = time.perf_counter() - t0
 
+    for _ in range(tasks):
+        arr = list(range(n))  # sorted every time -> worst-case for this quicksort
+        lin.append(time_call(linear_search, arr, target))
+        sortbin.append(time_call(sort_then_binary_search, arr, target))
+        planned.append(time_call(lookup, target))
 
-def time_one(fn, arr, target):
-    t0 = time.perf_counter()
-    fn(arr, target)
-    t1 = time.perf_counter()
-    return t1 - t0
+    return [summarize(lin)["median"], summarize(sortbin)["median"],
+            summarize(planned)["median"] + build / tasks]
 
 
-def run_worst_case(sizes, tasks=100):
+def run_worst_case(sizes, tasks=100, store=None):
     """
     Worst-case setup:
       - Each task uses a sorted array (already sorted)
-      - With last-element pivot quicksort, that yields worst-case behavior
+      - With last-element pivot quicksort, that yields worst-case behavior;
+        the introsort engine picks the median instead, so this stays O(n log n)
+    The planned series builds its lookup (linear or SortedIndex, per
+    plan_lookups()) once per n and spreads that cost over the tasks.
+    With a ResultStore, sizes measured on an earlier run are read back.
     """
     lin_times = []
     sortbin_times = []
+    planned_times = []
 
     for n in sizes:
-        target = n // 2
-        t_lin = 0.0
-        t_sortbin = 0.0
+        if store is None:
+            t_lin, t_sortbin, t_planned = measure_size(n, tasks)
+        else:
+            t_lin, t_sortbin, t_planned = store.cached(
+                (linear_search, sort_then_binary_search, make_lookup), "range(n)", n,
+                lambda: measure_size(n, tasks), params={"tasks": tasks})
 
-        for _ in range(tasks):
-            arr = list(range(n))  # sorted every time -> worst-case for this quicksort
-            t_lin += time_one(linear_search, arr, target)
-            t_sortbin += time_one(sort_then_binary_search, arr, target)
+        lin_times.append(t_lin)
+        sortbin_times.append(t_sortbin)
+        planned_times.append(t_planned)
 
-        lin_times.append(t_lin / tasks)
-        sortbin_times.append(t_sortbin / tasks)
+    return lin_times, sortbin_times, planned_times
 
-    return lin_times, sortbin_times
 
+def plot_results(sizes, lin_times, sortbin_times, title, planned_times=None):
+    plt = report.pyplot()
 
-def plot_results(sizes, lin_times, sortbin_times, title):
     plt.plot(sizes, lin_times, "o-", label="Linear search")
     plt.plot(sizes, sortbin_times, "o-", label="Worst-case quicksort + binary search")
+    if planned_times is not None:
+        plt.plot(sizes, planned_times, "o-", label="Planned (linear or index built once, LRU result cache)")
     plt.xlabel("Input size (n)")
-    plt.ylabel("Avg time per task (seconds)")
+    plt.ylabel("Median time per task (seconds)")
     plt.title(title)
     plt.legend()
     plt.xscale("log")
-    plt.show()
+    report.show("search")
 
 
 if __name__ == "__main__":
     sizes = [10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
-    lin_times, sortbin_times = run_worst_case(sizes, tasks=100)
-    plot_results(sizes, lin_times, sortbin_times, "Exercise 6 (Worst-case quicksort)")
+    lin_times, sortbin_times, planned_times = run_worst_case(sizes, tasks=100, store=ResultStore())
+    plot_results(sizes, lin_times, sortbin_times, "Exercise 6 (Worst-case quicksort)",
+                 planned_times=planned_times)
 
     """
     Discussion (comments):
     - Linear search cost ~ O(n)
-    - Quicksort here becomes O(n^2) due to sorted input + last-element pivot
-    - So "sort then binary search" becomes dramatically slower as n grows
+    - With the original last-element pivot, quicksort became O(n^2) on sorted input
+      and "sort then binary search" got dramatically slower as n grew
+    - sortlib.quick uses a median-of-three pivot with a heapsort fallback, so the
+      sorted case is O(n log n) and the gap to linear search is only the log factor
+    - The planned series answers repeated targets from an LRU cache (sortlib.cache),
+      so with a constant target only the first task pays for a search
     """
\ No newline at end of file
@@ -1,57 +1,25 @@
-import json
+import os
+import sys
 import time
 import random
-import matplotlib.pyplot as plt
 
-
-
-def binary_search_first_mid(arr, target, first_mid_index):
-    """
-    Returns True/False. First iteration uses first_mid_index as the midpoint.
-    All later iterations use standard midpoint splitting.
-    """
-    n = len(arr)
-    if n == 0:
-        return False
-
-    # clamp the first mid into range
-    mid = max(0, min(n - 1, first_mid_index))
-
-    lo, hi = 0, n - 1
-
-    # first probe
-    if arr[mid] == target:
-        return True
-    elif arr[mid] < target:
-        lo = mid + 1
-    else:
-        hi = mid - 1
-
-    # standard binary search after the first step
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        if arr[mid] == target:
-            return True
-        elif arr[mid] < target:
-            lo = mid + 1
-        else:
-            hi = mid - 1
-
-    return False
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from sortlib.bench import report
+from sortlib.batch import batch_binary_search
+from sortlib.bench.timing import measure
+from sortlib.learned import compare_probes
+from sortlib.loader import iter_json_ints, sorted_keys
+from sortlib.search import binary_search_first_mid, binary_search_probes, lower_bound
 
 
 def time_search(arr, target, first_mid_index, repeats=30):
     """
-    Times the same search multiple times and returns the best (min) time.
-    Using min helps reduce noise from OS scheduling.
+    Times the same search with the shared harness (calls batched to beat the
+    timer resolution, GC off, outliers dropped) and returns the median.
     """
-    best = float("inf")
-    for _ in range(repeats):
-        t0 = time.perf_counter()
-        binary_search_first_mid(arr, target, first_mid_index)
-        t1 = time.perf_counter()
-        best = min(best, t1 - t0)
-    return best
+    stats = measure(binary_search_first_mid, args=(arr, target, first_mid_index),
+                    min_repeats=repeats, max_repeats=repeats, n_boot=0)
+    return stats["median"]
 
 
 def candidate_midpoints(n, k=25):
@@ -79,31 +47,80 @@ def candidate_midpoints(n, k=25):
 
 
 
-def best_midpoint_for_task(arr, task_value):
+def optimal_first_mid(arr, task_value):
+    """
+    Picks the first midpoint from the target's rank in O(log n), no timing.
+    If the value is present, probing its own index finds it in 1 probe.
+    If it is absent, try the two neighbours of its insertion point, which
+    leave the smallest range on either side; this is never more than one
+    probe above the true optimum (any other first probe leaves a range at
+    least as large, and binary search depth only varies by one per size).
+    Returns (index, probes).
+    """
+    n = len(arr)
+    if n == 0:
+        return 0, 0
+    r = lower_bound(arr, task_value)
+    if r < n and arr[r] == task_value:
+        return r, 1
+
+    best_idx, best_probes = None, None
+    for idx in (r - 1, r):
+        if 0 <= idx < n:
+            _, probes = binary_search_probes(arr, task_value, idx)
+            if best_probes is None or probes < best_probes:
+                best_idx, best_probes = idx, probes
+    return best_idx, best_probes
+
+
+def best_midpoint_for_task(arr, task_value, mode="timed"):
+    """
+    Chooses the best first midpoint for task_value. Returns (index, score).
+      timed  - min time over candidate_midpoints (score in seconds, noisy)
+      probes - exact probe count over candidate_midpoints (reproducible)
+      rank   - optimal_first_mid, computed from the value's rank
+    """
+    if mode == "rank":
+        return optimal_first_mid(arr, task_value)
+
     n = len(arr)
     cands = candidate_midpoints(n, k=25)
 
     best_idx = cands[0]
-    best_time = float("inf")
+    best_score = float("inf")
 
     for idx in cands:
-        t = time_search(arr, task_value, idx, repeats=20)
-        if t < best_time:
-            best_time = t
+        if mode == "probes":
+            _, score = binary_search_probes(arr, task_value, idx)
+        elif mode == "timed":
+            score = time_search(arr, task_value, idx, repeats=20)
+        else:
+            raise ValueError(f"unknown mode {mode!r}")
+        if score < best_score:
+            best_score = score
             best_idx = idx
 
-    return best_idx, best_time
-
-def main():
-    # Load the lab files (put ex7data.json and ex7tasks.json in same folder)
-    with open("ex7data.json", "r") as f:
-        arr = json.load(f)
+    return best_idx, best_score
 
-    with open("ex7tasks.json", "r") as f:
-        tasks = json.load(f)
+def main(mode="rank"):
+    # Load the lab files (put ex7data.json and ex7tasks.json in same folder).
+    # The data is sorted once into ex7data.sorted.bin and memory-mapped from
+    # then on (8 bytes per value, no parse on later runs).
+    t0 = time.perf_counter()
+    arr = sorted_keys("ex7data.json")
+    tasks = list(iter_json_ints("ex7tasks.json"))
+    print(f"loaded {len(arr)} values and {len(tasks)} tasks in {time.perf_counter() - t0:.3f}s")
 
+    # one vectorized lookup for every task instead of a Python loop
+    found, _ = batch_binary_search(arr, tasks)
+    print(f"{int(found.sum())} of {len(tasks)} task values are present in the data")
 
-    arr.sort()
+    # value-aware searches: probes per task vs plain binary search
+    probes = compare_probes(arr, tasks)
+    for name, stats in probes.items():
+        print(f"{name:13s} avg probes={stats['avg']:.2f}  max={stats['max']}")
+    report.note("Probes per task (avg / max)",
+                {name: f"{s['avg']:.2f} / {s['max']}" for name, s in probes.items()})
 
     chosen = []  # list of (task_value, best_midpoint_index)
 
@@ -111,19 +128,23 @@ def main():
     tasks = tasks.copy()
     random.shuffle(tasks)
 
+    t0 = time.perf_counter()
     for x in tasks:
-        best_idx, best_t = best_midpoint_for_task(arr, x)
+        best_idx, _ = best_midpoint_for_task(arr, x, mode=mode)
         chosen.append((x, best_idx))
+    t1 = time.perf_counter()
+    print(f"chose first midpoints for {len(tasks)} tasks ({mode}) in {t1 - t0:.3f}s")
 
 
     xs = [p[0] for p in chosen]
     ys = [p[1] for p in chosen]
 
+    plt = report.pyplot()
     plt.scatter(xs, ys, s=12)
     plt.xlabel("Task value (number being searched)")
     plt.ylabel("Chosen first midpoint index")
     plt.title("Exercise 7: Best first-midpoint by task value")
-    plt.show()
+    report.show("first_mid")
 
 
     """
@@ -138,8 +159,12 @@ def main():
         (2) timing noise dominates because binary search is extremely fast,
         (3) many tasks are near the middle anyway,
         (4) Python overhead is larger than the algorithmic differences.
+    - main() now defaults to mode="rank", which counts probes instead of timing,
+      so (2) and (4) no longer apply: the chosen index is (next to) the target's
+      rank, i.e. exactly the value-proportional trend on uniform data.
+      Pass mode="timed" to reproduce the original measurement.
     """
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(sys.argv[1] if len(sys.argv) > 1 else "rank")
\ No newline at end of file
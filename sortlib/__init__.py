@@ -0,0 +1,34 @@
+"""
+Shared sorting/searching code used by the exercise scripts.
+
+Only pure-Python modules are imported here; numpy and matplotlib are
+imported lazily by the functions that need them.
+"""
+
+from sortlib.buffers import as_typed
+from sortlib.cache import SearchCache
+from sortlib.counting import count
+from sortlib.hybrid import hybrid_sort
+from sortlib.index import SortedIndex, make_lookup, plan_lookups
+from sortlib.inversions import bubble_stats, count_inversions
+from sortlib.keysort import argsort, lexsort, sort_records
+from sortlib.learned import LearnedIndex, interpolation_search
+from sortlib.merge import merge_sort, merge_sort_recursive
+from sortlib.quick import heapsort, quicksort
+from sortlib.radix import counting_sort, radix_sort
+from sortlib.registry import get, get_counter, info, names, register
+from sortlib.search import (
+    binary_search,
+    binary_search_first_mid,
+    binary_search_probes,
+    gallop_right,
+    linear_search,
+    lower_bound,
+)
+from sortlib.simple import (
+    binary_insertion_sort,
+    block_insertion_sort,
+    bubble_sort,
+    bubble_sort_with_counts,
+    insertion_sort,
+)
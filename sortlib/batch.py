@@ -0,0 +1,108 @@
+"""
+Vectorized lookups: answer a whole array of targets in one numpy call
+instead of one Python-level search per target.
+
+Both functions return (found, positions) as numpy arrays of len(targets).
+Tables and targets must be integers within int64 (TypeError / ValueError
+otherwise, see int64_keys): a cast would truncate 2.5 to 2 and report a
+hit.
+"""
+
+
+def as_int64(values):
+    """Contiguous int64 view/copy of values (no copy if it already is one)."""
+    import numpy as np
+
+    return np.ascontiguousarray(values, dtype=np.int64)
+
+
+def int64_keys(values):
+    """
+    as_int64(values), refusing anything it would change: TypeError unless
+    every value is an integer (floats would be truncated), ValueError if one
+    is outside int64 (uint64 values from 2**63 would wrap).
+    """
+    import numpy as np
+
+    from sortlib.buffers import as_numpy, is_typed
+
+    keys = as_numpy(values) if is_typed(values) else np.asarray(values)
+    if not len(keys):
+        return np.empty(0, dtype=np.int64)
+    kind = keys.dtype.kind
+    # object dtype: a list holding ints beyond 64 bits, or a mix numpy cannot type
+    if kind == "O" and all(isinstance(v, (int, np.integer)) for v in keys.ravel()):
+        raise ValueError("integer keys must fit in int64")
+    if kind not in "iub":
+        raise TypeError(f"integer keys expected, got {keys.dtype} values")
+    if kind == "u" and keys.dtype.itemsize == 8 and len(keys) and int(keys.max()) >= 2**63:
+        raise ValueError("integer keys must fit in int64")
+    return as_int64(keys)
+
+
+def batch_binary_search(sorted_arr, targets):
+    """
+    Looks up every target in sorted_arr with a single np.searchsorted.
+    positions[i] is the insertion point (first index with value >= target),
+    found[i] says whether sorted_arr[positions[i]] == targets[i].
+    """
+    import numpy as np
+
+    table = int64_keys(sorted_arr)
+    queries = int64_keys(targets)
+    positions = np.searchsorted(table, queries, side="left")
+    found = np.zeros(len(queries), dtype=bool)
+    inside = positions < len(table)
+    found[inside] = table[positions[inside]] == queries[inside]
+    return found, positions
+
+
+def batch_linear_search(arr, targets):
+    """
+    Membership test against an unsorted arr for every target.
+    positions[i] is the index of the first occurrence of targets[i] in arr,
+    or -1 when it is absent. Cost is one O(n log n) argsort plus
+    O(m log n) for the queries, rather than O(n * m).
+    """
+    import numpy as np
+
+    table = int64_keys(arr)
+    order = np.argsort(table, kind="stable")
+    found, pos = batch_binary_search(table[order], targets)
+    positions = np.full(len(found), -1, dtype=np.int64)
+    positions[found] = order[pos[found]]
+    return found, positions
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    import numpy as np
+
+    n = m = 10**6
+    rng = np.random.default_rng(338)
+    table = np.sort(rng.integers(0, 10 * n, size=n))
+    queries = rng.integers(0, 10 * n, size=m)
+
+    t0 = time.perf_counter()
+    found, _ = batch_binary_search(table, queries)
+    t1 = time.perf_counter()
+    print(f"batch binary: {m:,} queries vs {n:,} table in {t1 - t0:.3f}s "
+          f"({int(found.sum()):,} found)")
+
+    t0 = time.perf_counter()
+    found, _ = batch_linear_search(rng.permutation(table), queries)
+    t1 = time.perf_counter()
+    print(f"batch linear (unsorted table): {t1 - t0:.3f}s ({int(found.sum()):,} found)")
+
+    from sortlib.search import binary_search
+
+    as_list = table.tolist()
+    sample = random.Random(338).sample(queries.tolist(), 10_000)
+    t0 = time.perf_counter()
+    for x in sample:
+        binary_search(as_list, x)
+    t1 = time.perf_counter()
+    print(f"per-call binary_search: {(t1 - t0) / len(sample) * m:.1f}s "
+          f"estimated for {m:,} queries")
@@ -0,0 +1 @@
+"""Benchmark infrastructure shared by the exercise drivers."""
@@ -0,0 +1,126 @@
+"""
+Measures the switch points used by sortlib.hybrid on this machine.
+
+Each threshold is a crossover like Ex2's bubble/quick one: time the two
+candidate algorithms over a range of inputs and record where the second
+one starts winning. Run as `python -m sortlib.bench.calibrate` (Ex2's
+driver also does this after its own grid) to rewrite the calibration file.
+"""
+
+import random
+
+from sortlib.bench.timing import measure
+from sortlib.hybrid import PROBE_SAMPLE, probe, save_thresholds
+from sortlib.merge import merge_sort
+from sortlib.quick import quicksort
+from sortlib.radix import counting_sort, radix_sort
+from sortlib.simple import binary_insertion_sort_range
+
+INSERTION_SIZES = [8, 12, 16, 24, 32, 48, 64, 96, 128, 192, 256]
+SWAP_FRACTIONS = [0.0, 0.0025, 0.005, 0.01, 0.02, 0.04, 0.08, 0.16]
+DISTINCT_FRACTIONS = [1.0, 0.5, 0.25, 0.1, 0.05, 0.02, 0.01, 0.005]
+PROBE_N = 5000
+RADIX_SIZES = [16, 32, 64, 128, 256, 512, 1024, 2048]
+SPAN_RATIOS = [0.01, 0.1, 0.5, 1, 2, 4, 8, 16]
+
+
+def crossover(xs, slow_times, fast_times):
+    """Index of the first x where fast_times beats slow_times, or None."""
+    for i, (s, f) in enumerate(zip(slow_times, fast_times)):
+        if f < s:
+            return i
+    return None
+
+
+def _time(fn, base, max_time):
+    return measure(fn, setup=lambda: (base[:],), min_repeats=5, max_time=max_time,
+                   n_boot=0)["median"]
+
+
+def _insertion(arr):
+    binary_insertion_sort_range(arr, 0, len(arr) - 1)
+
+
+def _two_way(arr):
+    quicksort(arr, three_way=False)
+
+
+def _three_way(arr):
+    quicksort(arr, three_way=True)
+
+
+def calibrate(seed=0, max_time=0.05, verbose=True):
+    """Returns (thresholds, measurements) for sortlib.hybrid.save_thresholds."""
+    rng = random.Random(seed)
+    thresholds = {}
+    measurements = {}
+
+    # insertion vs quick on random input, by size
+    ins, quick = [], []
+    for n in INSERTION_SIZES:
+        base = rng.sample(range(10 * n), n)
+        ins.append(_time(_insertion, base, max_time))
+        quick.append(_time(quicksort, base, max_time))
+    i = crossover(INSERTION_SIZES, ins, quick)
+    thresholds["insertion_max"] = INSERTION_SIZES[-1] if i is None else (
+        INSERTION_SIZES[i - 1] if i > 0 else 0)
+    measurements["insertion_vs_quick"] = {"n": INSERTION_SIZES, "insertion": ins, "quick": quick}
+
+    # merge vs quick on sorted input with a fraction of random swaps, by disorder
+    disorder, merge_t, quick = [], [], []
+    for frac in SWAP_FRACTIONS:
+        base = list(range(PROBE_N))
+        for _ in range(int(frac * PROBE_N)):
+            a, b = rng.randrange(PROBE_N), rng.randrange(PROBE_N)
+            base[a], base[b] = base[b], base[a]
+        disorder.append(sum(1 for j in range(PROBE_N - 1) if base[j + 1] < base[j]) / (PROBE_N - 1))
+        merge_t.append(_time(merge_sort, base, max_time))
+        quick.append(_time(quicksort, base, max_time))
+    i = crossover(disorder, merge_t, quick)
+    thresholds["presorted_max_disorder"] = disorder[-1] if i is None else (
+        disorder[i - 1] if i > 0 else -1.0)
+    measurements["merge_vs_quick"] = {"disorder": disorder, "merge": merge_t, "quick": quick}
+
+    # two-way vs three-way partitioning, by share of repeated values (as probe() sees it)
+    dups, two, three = [], [], []
+    for frac in DISTINCT_FRACTIONS:
+        distinct = max(1, int(frac * PROBE_N))
+        base = [rng.randrange(distinct) for _ in range(PROBE_N)]
+        dups.append(sum(probe(base, PROBE_SAMPLE, s)["dups"] for s in range(8)) / 8)
+        two.append(_time(_two_way, base, max_time))
+        three.append(_time(_three_way, base, max_time))
+    i = crossover(dups, two, three)
+    thresholds["three_way_min_dups"] = 1.1 if i is None else dups[i]
+    measurements["two_vs_three_way"] = {"dups": dups, "two_way": two, "three_way": three}
+
+    # radix vs quick on random integers, by size
+    radix, quick = [], []
+    for n in RADIX_SIZES:
+        base = rng.sample(range(10 * n), n)
+        radix.append(_time(radix_sort, base, max_time))
+        quick.append(_time(quicksort, base, max_time))
+    i = crossover(RADIX_SIZES, quick, radix)
+    thresholds["radix_min_n"] = float("inf") if i is None else RADIX_SIZES[i]
+    measurements["quick_vs_radix"] = {"n": RADIX_SIZES, "quick": quick, "radix": radix}
+
+    # counting vs radix on integers, by (max - min) / n
+    counting, radix = [], []
+    for ratio in SPAN_RATIOS:
+        span = max(1, int(ratio * PROBE_N))
+        base = [rng.randrange(span + 1) for _ in range(PROBE_N)]
+        counting.append(_time(counting_sort, base, max_time))
+        radix.append(_time(radix_sort, base, max_time))
+    i = crossover(SPAN_RATIOS, counting, radix)
+    thresholds["counting_max_span_ratio"] = SPAN_RATIOS[-1] if i is None else (
+        SPAN_RATIOS[i - 1] if i > 0 else 0.0)
+    measurements["counting_vs_radix"] = {"span_ratio": SPAN_RATIOS, "counting": counting,
+                                         "radix": radix}
+
+    if verbose:
+        for name, value in thresholds.items():
+            print(f"{name}: {value:.4g}")
+    return thresholds, measurements
+
+
+if __name__ == "__main__":
+    save_thresholds(*calibrate())
@@ -0,0 +1,139 @@
+"""
+Which growth law does a set of (n, time) measurements follow?
+
+fit() tries every model in MODELS as time ~ a + b*f(n), by least squares on
+relative error (timings span orders of magnitude, so a 10% miss at small n
+should count as much as one at large n). Models are ranked by AIC and
+checked by k-fold cross-validation. loglog_exponent() regresses log time
+on log n for the empirical exponent with a 95% interval: ~1 for linear,
+a bit above 1 for n log n, ~2 for quadratic.
+
+check() compares the winner against an expected model, so a sweep can
+flag an algorithm drifting from n log n to quadratic. Run
+`python -m sortlib.bench.fit` to fit every series in the result store.
+numpy is imported inside the functions.
+"""
+
+import math
+
+from sortlib.bench.timing import Z95
+
+# name -> f(n); every model also gets an intercept unless fit(intercept=False)
+MODELS = {
+    "1": lambda n: n * 0 + 1,
+    "log n": lambda n: _log2(n),
+    "n": lambda n: n,
+    "n log n": lambda n: n * _log2(n),
+    "n^2": lambda n: n ** 2,
+    "n^3": lambda n: n ** 3,
+}
+
+# models in order of growth, for check()
+ORDER = list(MODELS)
+
+
+def _log2(n):
+    import numpy as np
+
+    return np.log2(n)
+
+
+def _lstsq(X, y, w):
+    import numpy as np
+
+    coef, *_ = np.linalg.lstsq(X * w[:, None], y * w, rcond=None)
+    resid = (y - X @ coef) * w
+    return coef, float(resid @ resid)
+
+
+def _design(n, name, intercept):
+    import numpy as np
+
+    f = MODELS[name](n)
+    if name == "1" or not intercept:
+        return f[:, None]
+    return np.column_stack([np.ones_like(n), f])
+
+
+def fit_model(n, y, name, intercept=True, folds=5):
+    """Fit of one model: {"coef", "rss", "aic", "cv_rmse"} (rss/rmse on relative error)."""
+    import numpy as np
+
+    n = np.asarray(n, dtype=float)
+    y = np.asarray(y, dtype=float)
+    w = 1.0 / np.abs(y)
+    X = _design(n, name, intercept)
+    coef, rss = _lstsq(X, y, w)
+    m, k = len(y), X.shape[1]
+    aic = m * math.log(max(rss, 1e-300) / m) + 2 * k
+
+    # k-fold cross-validation with interleaved folds (every folds-th point)
+    errs = []
+    for fold in range(min(folds, m)):
+        test = np.arange(m) % folds == fold
+        if test.all() or (~test).sum() < k:
+            continue
+        c, _ = _lstsq(X[~test], y[~test], w[~test])
+        errs.append(((y[test] - X[test] @ c) * w[test]) ** 2)
+    cv_rmse = float(np.sqrt(np.concatenate(errs).mean())) if errs else float("nan")
+
+    return {"coef": [float(c) for c in coef], "rss": rss, "aic": aic, "cv_rmse": cv_rmse}
+
+
+def loglog_exponent(n, y):
+    """Slope of log y against log n with its 95% interval: {"exponent", "ci_low", "ci_high"}."""
+    import numpy as np
+
+    x = np.log(np.asarray(n, dtype=float))
+    ly = np.log(np.asarray(y, dtype=float))
+    m = len(x)
+    xm = x - x.mean()
+    slope = float(xm @ (ly - ly.mean()) / (xm @ xm))
+    resid = ly - ly.mean() - slope * xm
+    se = math.sqrt(float(resid @ resid) / max(m - 2, 1) / float(xm @ xm)) if m > 2 else float("inf")
+    return {"exponent": slope, "ci_low": slope - Z95 * se, "ci_high": slope + Z95 * se}
+
+
+def fit(n, y, models=None, intercept=True, criterion="aic"):
+    """
+    Fits every model and returns {"models": {name: fit_model()}, "best",
+    "exponent": loglog_exponent()}. criterion is "aic" or "cv".
+    """
+    names = models or ORDER
+    fits = {name: fit_model(n, y, name, intercept) for name in names}
+    key = "aic" if criterion == "aic" else "cv_rmse"
+    best = min(fits, key=lambda name: fits[name][key])
+    return {"models": fits, "best": best, "exponent": loglog_exponent(n, y)}
+
+
+def check(n, y, expected, criterion="aic"):
+    """
+    Fits (n, y) and reports whether it grows faster than the expected model:
+    {"best", "expected", "drift", "exponent"}; drift is True when the best
+    model is above expected in ORDER.
+    """
+    result = fit(n, y, criterion=criterion)
+    return {
+        "best": result["best"],
+        "expected": expected,
+        "drift": ORDER.index(result["best"]) > ORDER.index(expected),
+        "exponent": result["exponent"],
+    }
+
+
+def _describe(result):
+    e = result["exponent"]
+    return (f"best {result['best']:8s} exponent {e['exponent']:.2f} "
+            f"[{e['ci_low']:.2f}, {e['ci_high']:.2f}]")
+
+
+if __name__ == "__main__":
+    from sortlib.bench.store import ResultStore
+
+    store = ResultStore()
+    for algorithm, generator, points in store.all_series():
+        ns = [n for n, v in points if isinstance(v, (int, float)) and v > 0]
+        ys = [v for n, v in points if isinstance(v, (int, float)) and v > 0]
+        if len(ns) < 8:
+            continue
+        print(f"{algorithm:40s} {generator:22s} {_describe(fit(ns, ys))}")
@@ -0,0 +1,60 @@
+"""
+Fan independent benchmark cells out over worker processes.
+
+Each worker is pinned to its own CPU (where the OS supports it) so cells
+measured at the same time do not share a core, and one worker is started
+per available core.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing as mp
+
+
+def available_cpus():
+    """CPU ids this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _pin_worker(cpu_queue):
+    cpu = cpu_queue.get()
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except OSError:
+            pass
+
+
+def _call(fn, args):
+    return fn(*args)
+
+
+def run_parallel(tasks, max_workers=None, pin=True):
+    """
+    Runs every task in a process pool and returns {key: result}.
+
+    tasks is a list of (key, fn, args); fn must be importable (module-level)
+    so it can be sent to the workers. Tasks are submitted in list order, so
+    put the most expensive ones first to keep the tail short.
+    """
+    cpus = available_cpus()
+    if max_workers is None:
+        max_workers = len(cpus)
+    max_workers = max(1, min(max_workers, len(tasks) or 1))
+
+    initializer = initargs = None
+    if pin:
+        cpu_queue = mp.Queue()
+        for i in range(max_workers):
+            cpu_queue.put(cpus[i % len(cpus)])
+        initializer, initargs = _pin_worker, (cpu_queue,)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=initializer,
+                             initargs=initargs or ()) as pool:
+        futures = {pool.submit(_call, fn, args): key for key, fn, args in tasks}
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+    return results
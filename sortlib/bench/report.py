@@ -0,0 +1,114 @@
+"""
+Headless reporting for the exercise drivers.
+
+When $SORTLIB_REPORT names a directory, the drivers' plotting calls render
+with matplotlib's non-interactive Agg backend into <dir>/figures/ (PNG and
+SVG) instead of blocking on plt.show(), and the numbers they print (fitted
+constants, crossover points, ...) are collected as well. Each script writes
+its own section file, and <dir>/report.md is rebuilt from all sections, so
+a nightly job can run every script and read a single summary.
+
+Without $SORTLIB_REPORT nothing changes: figures are shown interactively.
+matplotlib is only imported when a figure is actually drawn.
+"""
+
+import atexit
+import os
+import sys
+
+ENV_VAR = "SORTLIB_REPORT"
+
+_current = None
+
+
+class Report:
+    def __init__(self, out_dir, section):
+        self.out_dir = os.path.abspath(out_dir)
+        self.section = section
+        self.figures = []
+        self.entries = []  # (heading, markdown body)
+        os.makedirs(os.path.join(self.out_dir, "figures"), exist_ok=True)
+        os.makedirs(os.path.join(self.out_dir, "sections"), exist_ok=True)
+
+    def save_figure(self, fig, name):
+        stem = f"{self.section}_{name}"
+        for ext in ("png", "svg"):
+            fig.savefig(os.path.join(self.out_dir, "figures", f"{stem}.{ext}"))
+        self.figures.append(stem)
+
+    def add(self, heading, body):
+        """Adds a block to this section; body is text, or a dict rendered as a table."""
+        if isinstance(body, dict):
+            lines = ["| | |", "|---|---|"]
+            lines += [f"| {k} | {_fmt(v)} |" for k, v in body.items()]
+            body = "\n".join(lines)
+        self.entries.append((heading, body))
+
+    def write(self):
+        parts = [f"## {self.section}\n"]
+        for heading, body in self.entries:
+            parts.append(f"### {heading}\n\n{body}\n")
+        for stem in self.figures:
+            parts.append(f"![{stem}](figures/{stem}.png)\n")
+        with open(os.path.join(self.out_dir, "sections", f"{self.section}.md"), "w") as f:
+            f.write("\n".join(parts))
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        sections_dir = os.path.join(self.out_dir, "sections")
+        parts = ["# Benchmark report\n"]
+        for name in sorted(os.listdir(sections_dir)):
+            if name.endswith(".md"):
+                with open(os.path.join(sections_dir, name)) as f:
+                    parts.append(f.read())
+        with open(os.path.join(self.out_dir, "report.md"), "w") as f:
+            f.write("\n".join(parts))
+
+
+def _fmt(v):
+    if isinstance(v, float):
+        return f"{v:.6g}"
+    return str(v)
+
+
+def current():
+    """The active Report (created from $SORTLIB_REPORT on first use), or None."""
+    global _current
+    out_dir = os.environ.get(ENV_VAR)
+    if not out_dir:
+        return None
+    if _current is None:
+        script = sys.argv[0] if sys.argv and sys.argv[0] not in ("", "-c") else "interactive"
+        _current = Report(out_dir, os.path.splitext(os.path.basename(script))[0])
+        atexit.register(_current.write)
+    return _current
+
+
+def pyplot():
+    """matplotlib.pyplot, on the Agg backend when a report is active."""
+    import matplotlib
+
+    if current() is not None:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def show(name, fig=None):
+    """plt.show(), or save the figure into the active report and close it."""
+    plt = pyplot()
+    report = current()
+    if report is None:
+        plt.show()
+        return
+    fig = fig or plt.gcf()
+    report.save_figure(fig, name)
+    plt.close(fig)
+
+
+def note(heading, body):
+    """Records numbers for the summary; does nothing without an active report."""
+    report = current()
+    if report is not None:
+        report.add(heading, body)
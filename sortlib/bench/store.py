@@ -0,0 +1,241 @@
+"""
+Persistent benchmark results, so re-runs only measure what is missing.
+
+Every measured cell is written to an SQLite file as soon as it is known,
+keyed by algorithm name, a hash of the algorithm's module source and of
+every sortlib module it imports (directly or through other sortlib
+modules, at module level or inside functions), the input generator, n,
+seed, extra parameters (repeats, ...) and the Python version. Re-running a
+driver skips cells already in the store, an interrupted sweep resumes
+where it stopped, and editing an algorithm or anything it depends on
+changes its hash so only the affected cells are measured again.
+"""
+
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import platform
+import re
+import sqlite3
+import sys
+import time
+
+DEFAULT_PATH = os.environ.get(
+    "SORTLIB_RESULTS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "bench_results.sqlite"),
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    algorithm  TEXT NOT NULL,
+    code_hash  TEXT NOT NULL,
+    generator  TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    n          INTEGER NOT NULL,
+    seed       TEXT NOT NULL,
+    params     TEXT NOT NULL,
+    python     TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    created    REAL NOT NULL,
+    PRIMARY KEY (algorithm, code_hash, generator, input_hash, n, seed, params, python)
+)
+"""
+
+_IMPORT = re.compile(
+    r"^\s*(?:from\s+(sortlib[\w.]*)\s+import\s+\(?([\w\s,]+)|import\s+(sortlib[\w.]*))",
+    re.M,
+)
+
+_hash_cache = {}
+
+
+def _module_path(name):
+    path = getattr(sys.modules.get(name), "__file__", None)
+    if path is None:
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            return None
+        path = spec.origin if spec is not None else None
+    return path if path and path.endswith(".py") else None
+
+
+def _module_source(name):
+    path = _module_path(name)
+    if path is None:
+        return None
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _sortlib_imports(name, src):
+    """Names of the sortlib modules that module name (with source src) imports."""
+    deps = set()
+    module = sys.modules.get(name)
+    if module is not None:
+        for value in vars(module).values():
+            dep = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+            if isinstance(dep, str) and dep.split(".")[0] == "sortlib":
+                deps.add(dep)
+    # also catches the imports done inside functions
+    for package, names, plain in _IMPORT.findall(src):
+        if plain:
+            deps.add(plain)
+            continue
+        deps.add(package)
+        if (_module_path(package) or "").endswith("__init__.py"):
+            for attr in re.findall(r"\w+", names):
+                if _module_path(f"{package}.{attr}"):
+                    deps.add(f"{package}.{attr}")
+    return deps
+
+
+def _closure_hash(name):
+    """Hash of module name's source and that of every sortlib module it reaches."""
+    sources = {}
+    todo = [name]
+    while todo:
+        current = todo.pop()
+        if current in sources:
+            continue
+        src = _module_source(current) or ""
+        sources[current] = src
+        # a package's __init__ re-exports everything; its own source is
+        # enough, the modules actually used are reached directly
+        if src and not _module_path(current).endswith("__init__.py"):
+            todo.extend(_sortlib_imports(current, src) - sources.keys())
+    h = hashlib.sha256()
+    for module in sorted(sources):
+        h.update(module.encode())
+        h.update(sources[module].encode())
+    return h.hexdigest()
+
+
+def code_hash(*fns):
+    """
+    Short hash of the source of the modules defining fns and of every
+    sortlib module they import, transitively.
+    """
+    h = hashlib.sha256()
+    for fn in fns:
+        module = getattr(fn, "__module__", None)
+        key = (module, getattr(fn, "__qualname__", repr(fn)))
+        if key not in _hash_cache:
+            if module is not None and _module_source(module) is not None:
+                _hash_cache[key] = _closure_hash(module)
+            else:
+                try:
+                    src = inspect.getsource(fn)
+                except (TypeError, OSError):
+                    src = key[1]
+                _hash_cache[key] = hashlib.sha256(src.encode()).hexdigest()
+        h.update(_hash_cache[key].encode())
+    return h.hexdigest()[:16]
+
+
+def input_digest(values):
+    """Short hash of an input array, for inputs not fully determined by (n, seed)."""
+    return hashlib.sha256(repr(list(values)).encode()).hexdigest()[:16]
+
+
+class ResultStore:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = os.path.abspath(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(_SCHEMA)
+        self.conn.commit()
+        self.python = platform.python_version()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, algorithm, generator, n, seed, params, input_hash):
+        fns = algorithm if isinstance(algorithm, (list, tuple)) else (algorithm,)
+        name = "+".join(getattr(fn, "__qualname__", str(fn)) for fn in fns)
+        return (name, code_hash(*fns), str(generator), input_hash or "", int(n),
+                str(seed), json.dumps(params or {}, sort_keys=True), self.python)
+
+    def get(self, algorithm, generator, n, seed=None, params=None, input_hash=None):
+        """Stored value for the cell, or None if it has not been measured."""
+        row = self.conn.execute(
+            "SELECT value FROM results WHERE algorithm=? AND code_hash=? AND generator=?"
+            " AND input_hash=? AND n=? AND seed=? AND params=? AND python=?",
+            self._key(algorithm, generator, n, seed, params, input_hash),
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, algorithm, generator, n, value, seed=None, params=None, input_hash=None):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self._key(algorithm, generator, n, seed, params, input_hash)
+            + (json.dumps(value), time.time()),
+        )
+        self.conn.commit()
+
+    def cached(self, algorithm, generator, n, measure, seed=None, params=None, input_hash=None):
+        """
+        Returns the stored value for the cell, or calls measure() and stores
+        its (JSON-serializable) result.
+
+        algorithm is the function being benchmarked, or a tuple of them when a
+        cell exercises several; their module sources make up the code hash.
+        """
+        value = self.get(algorithm, generator, n, seed, params, input_hash)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = measure()
+        self.put(algorithm, generator, n, value, seed, params, input_hash)
+        return value
+
+    def series(self, algorithm, generator, seed=None, params=None):
+        """[(n, value)] of every stored size for one algorithm/generator/params, by n."""
+        name, ch, gen, _, _, seed, params, python = self._key(algorithm, generator, 0, seed,
+                                                               params, None)
+        rows = self.conn.execute(
+            "SELECT n, value FROM results WHERE algorithm=? AND code_hash=? AND generator=?"
+            " AND seed=? AND params=? AND python=? ORDER BY n",
+            (name, ch, gen, seed, params, python),
+        ).fetchall()
+        return [(n, json.loads(v)) for n, v in rows]
+
+    def all_series(self):
+        """
+        (algorithm name, generator, [(n, value)]) for everything stored,
+        using the most recently measured code version of each algorithm.
+        """
+        latest = self.conn.execute(
+            "SELECT algorithm, generator, code_hash FROM results r WHERE created ="
+            " (SELECT MAX(created) FROM results WHERE algorithm=r.algorithm"
+            " AND generator=r.generator) ORDER BY algorithm, generator"
+        ).fetchall()
+        for algorithm, generator, ch in latest:
+            rows = self.conn.execute(
+                "SELECT n, value FROM results WHERE algorithm=? AND generator=? AND code_hash=?"
+                " AND python=? ORDER BY n",
+                (algorithm, generator, ch, self.python),
+            ).fetchall()
+            yield algorithm, generator, [(n, json.loads(v)) for n, v in rows]
+
+    def clear(self, algorithm_name=None):
+        """Deletes every stored cell, or only those of one algorithm name."""
+        if algorithm_name is None:
+            self.conn.execute("DELETE FROM results")
+        else:
+            self.conn.execute("DELETE FROM results WHERE algorithm=?", (algorithm_name,))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    store = ResultStore()
+    rows = store.conn.execute(
+        "SELECT algorithm, python, COUNT(*) FROM results GROUP BY algorithm, python"
+    ).fetchall()
+    print(store.path)
+    for algorithm, python, count in rows:
+        print(f"  {algorithm:40s} py{python}  {count} cells")
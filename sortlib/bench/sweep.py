@@ -0,0 +1,108 @@
+"""
+Adaptive choice of which sizes to measure in a sweep.
+
+Instead of timing every n in a range, adaptive_sweep() starts from a
+geometric grid and then only measures where it learns something: between
+neighbouring sizes whose points the best-fitting model (sortlib.bench.fit)
+misses, where the grid is still coarse (the fitted curve is least certain
+there), and, when several series are measured together, between sizes
+where their order flips (a crossover like Ex2's). It stops when the time
+budget runs out, when the fit is within rel_tol everywhere and the grid is
+no coarser than max_gap, or when max_points sizes have been measured.
+"""
+
+import math
+import time
+
+from sortlib.bench.fit import MODELS, fit
+
+
+def geometric_grid(lo, hi, count):
+    """About count distinct integers from lo to hi, evenly spaced in log n."""
+    if count < 2 or lo >= hi:
+        return [lo]
+    step = (math.log(hi) - math.log(lo)) / (count - 1)
+    return sorted({int(round(math.exp(math.log(lo) + i * step))) for i in range(count)})
+
+
+def _residuals(ns, ys):
+    """Relative residual of every point under the best model."""
+    import numpy as np
+
+    result = fit(ns, ys)
+    coef = result["models"][result["best"]]["coef"]
+    f = MODELS[result["best"]](np.asarray(ns, dtype=float))
+    pred = coef[0] * f if len(coef) == 1 else coef[0] + coef[1] * f
+    y = np.asarray(ys, dtype=float)
+    return (np.abs(y - pred) / np.abs(y)).tolist()
+
+
+def adaptive_sweep(measure, lo, hi, budget=30.0, initial=12, batch=4, rel_tol=0.05,
+                   max_gap=1.25, min_gap=1.02, max_points=400, verbose=False):
+    """
+    Calls measure(n) for a chosen set of sizes in [lo, hi]. measure returns
+    a time, or a dict {series name: time} to sweep several algorithms at
+    once. Returns {"sizes": [...], "series": {name: [times]}, "crossovers":
+    [(name_a, name_b, n_low, n_high), ...]}; with a plain time the single
+    series is called "time".
+
+    Intervals wider than max_gap (as a ratio of sizes) are always split;
+    narrower ones only while the fit misses their ends by more than rel_tol,
+    and never below min_gap, so timing noise cannot pull in every size.
+    """
+    start = time.perf_counter()
+    points = {}
+
+    def take(n):
+        value = measure(n)
+        points[n] = value if isinstance(value, dict) else {"time": value}
+
+    for n in geometric_grid(lo, hi, initial):
+        take(n)
+
+    while len(points) < max_points and time.perf_counter() - start < budget:
+        ns = sorted(points)
+        names = list(points[ns[0]])
+        resid = [0.0] * len(ns)
+        if len(ns) >= 4:
+            for name in names:
+                r = _residuals(ns, [points[n][name] for n in ns])
+                resid = [max(a, b) for a, b in zip(resid, r)]
+
+        scores = []
+        for i in range(len(ns) - 1):
+            a, b = ns[i], ns[i + 1]
+            if b - a < 2:
+                continue
+            gap = math.log(b / a)
+            miss = (resid[i] + resid[i + 1]) / 2
+            flips = any((points[a][x] < points[a][y]) != (points[b][x] < points[b][y])
+                        for x in names for y in names if x < y)
+            if flips:
+                # pin crossovers down to adjacent sizes first
+                scores.append((float("inf"), (a + b) // 2))
+            elif gap > math.log(max_gap) or (miss > rel_tol and gap > math.log(min_gap)):
+                scores.append((gap / math.log(max_gap) + miss / rel_tol, (a + b) // 2))
+        if not scores:
+            break
+        scores.sort(reverse=True)
+        for _, n in scores[:batch]:
+            if n not in points:
+                take(n)
+        if verbose:
+            print(f"{len(points)} sizes measured, worst residual {max(resid):.3f}")
+
+    ns = sorted(points)
+    names = list(points[ns[0]])
+    crossovers = []
+    for x in names:
+        for y in names:
+            if x < y:
+                for a, b in zip(ns, ns[1:]):
+                    if (points[a][x] < points[a][y]) != (points[b][x] < points[b][y]):
+                        crossovers.append((x, y, a, b))
+    return {
+        "sizes": ns,
+        "series": {name: [points[n][name] for n in ns] for name in names},
+        "crossovers": crossovers,
+    }
@@ -0,0 +1,143 @@
+"""
+One timing harness for every driver.
+
+measure() warms the function up, batches calls that are too short to time
+individually, disables the garbage collector while sampling, keeps taking
+samples until the median's confidence interval is tight enough (or a time
+budget runs out), drops outliers by median absolute deviation, and reports
+a bootstrap confidence interval for the median.
+"""
+
+import gc
+import math
+import random
+import statistics
+import time
+
+# z for a two-sided 95% interval
+Z95 = 1.96
+
+
+def _median_ci_ranks(n):
+    """Distribution-free ranks (lo, hi) bounding the median at ~95%."""
+    half = Z95 * math.sqrt(n) / 2
+    lo = max(0, int(math.floor(n / 2 - half)))
+    hi = min(n - 1, int(math.ceil(n / 2 + half)) - 1)
+    return lo, hi
+
+
+def reject_outliers(samples, k=3.0):
+    """Drops samples more than k scaled MADs away from the median."""
+    if len(samples) < 3:
+        return list(samples)
+    med = statistics.median(samples)
+    mad = statistics.median(abs(s - med) for s in samples) * 1.4826
+    if mad == 0:
+        return list(samples)
+    return [s for s in samples if abs(s - med) <= k * mad]
+
+
+def bootstrap_ci(samples, n_boot=1000, seed=0, stat=statistics.median):
+    """
+    95% percentile bootstrap interval for stat(samples). n_boot=0 falls back
+    to the (much cheaper) order-statistic interval for the median.
+    """
+    if len(samples) < 2:
+        v = samples[0] if samples else float("nan")
+        return v, v
+    if n_boot <= 0:
+        ordered = sorted(samples)
+        lo, hi = _median_ci_ranks(len(ordered))
+        return ordered[lo], ordered[hi]
+    rng = random.Random(seed)
+    boots = sorted(stat(rng.choices(samples, k=len(samples))) for _ in range(n_boot))
+    return boots[int(0.025 * (n_boot - 1))], boots[int(0.975 * (n_boot - 1))]
+
+
+def summarize(samples, outlier_k=3.0, n_boot=1000, seed=0):
+    """Statistics dict for a list of per-call times (seconds)."""
+    kept = reject_outliers(samples, outlier_k)
+    med = statistics.median(kept)
+    lo, hi = bootstrap_ci(kept, n_boot, seed)
+    return {
+        "median": med,
+        "mean": statistics.fmean(kept),
+        "min": min(kept),
+        "ci_low": lo,
+        "ci_high": hi,
+        "rel_ci": (hi - lo) / med if med > 0 else 0.0,
+        "samples": len(kept),
+        "rejected": len(samples) - len(kept),
+    }
+
+
+def time_call(fn, *args):
+    """Single timed call of fn(*args) with the garbage collector paused."""
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        fn(*args)
+        return time.perf_counter() - t0
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def measure(fn, args=(), setup=None, warmup=1, min_repeats=5, max_repeats=200,
+            target_rel_ci=0.02, max_time=1.0, min_sample_time=1e-4,
+            disable_gc=True, outlier_k=3.0, n_boot=1000, seed=0):
+    """
+    Times fn(*args) and returns the summarize() dict plus "number", the
+    calls averaged per sample.
+
+    setup, if given, is called before every call (untimed) and returns the
+    args to use, e.g. lambda: (base[:],) for a function that sorts in place.
+    Sampling stops once at least min_repeats samples are in and the median's
+    95% interval is within target_rel_ci of it, or at max_repeats samples,
+    or when max_time seconds have been spent.
+    """
+    def fresh_args():
+        return setup() if setup is not None else args
+
+    # calibrate (this call doubles as the first warmup): batch enough calls
+    # per sample to beat timer resolution
+    a = fresh_args()
+    t0 = time.perf_counter()
+    fn(*a)
+    single = time.perf_counter() - t0
+    number = 1 if single >= min_sample_time else max(1, math.ceil(min_sample_time / max(single, 1e-9)))
+    for _ in range(warmup - 1):
+        fn(*fresh_args())
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    start = time.perf_counter()
+    try:
+        while len(samples) < max_repeats:
+            batch = [fresh_args() for _ in range(number)]
+            if disable_gc:
+                gc.disable()
+            t0 = time.perf_counter()
+            for a in batch:
+                fn(*a)
+            t1 = time.perf_counter()
+            if gc_was_enabled:
+                gc.enable()
+            samples.append((t1 - t0) / number)
+
+            if len(samples) >= min_repeats:
+                ordered = sorted(samples)
+                lo, hi = _median_ci_ranks(len(ordered))
+                med = statistics.median(ordered)
+                if med > 0 and (ordered[hi] - ordered[lo]) / med <= target_rel_ci:
+                    break
+                if time.perf_counter() - start > max_time:
+                    break
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    result = summarize(samples, outlier_k, n_boot, seed)
+    result["number"] = number
+    return result
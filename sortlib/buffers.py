@@ -0,0 +1,88 @@
+"""
+Typed, array-backed buffers for the sorts.
+
+A list of n Python ints holds n 8-byte pointers to separate ~28-byte int
+objects, so 100M keys take ~3.6 GB; an int64 buffer takes 800 MB. Every
+sort in sortlib works on any 1-D mutable sequence with slicing and slice
+assignment, so besides lists they accept array.array, numpy arrays and
+writable memoryviews (over a bytearray, an mmap, shared memory, ...) and
+sort them in place without converting element by element. The catch is
+speed for the pure-Python sorts: every element they read from a typed
+buffer is boxed into a new int, so quicksort and merge_sort run ~1.7x
+(array.array) to ~2.7x (numpy) slower than on a list, while the vectorized
+ones (radix_sort, counting_sort, parallel_merge_sort) get faster, as they
+skip the list <-> numpy conversions.
+
+Copy policy: the sorts never copy their input. insertion_sort,
+binary_insertion_sort, block_insertion_sort and bubble_sort_with_counts
+also take copy=True, which sorts and returns a copy_of() the input and
+leaves the caller's buffer alone. Scratch space a sort
+needs (merge sort's buffer) is allocated with scratch(), which gives a
+real copy even for numpy arrays and memoryviews, where slicing only makes
+a view.
+
+numpy is imported inside the functions that need it.
+"""
+
+from array import array
+
+TYPECODE = "q"
+
+
+def _is_ndarray(arr):
+    return type(arr).__module__ == "numpy" and type(arr).__name__ == "ndarray"
+
+
+def is_typed(arr):
+    """True for array.array, numpy arrays and memoryviews."""
+    return isinstance(arr, (array, memoryview)) or _is_ndarray(arr)
+
+
+def as_typed(values, typecode=TYPECODE):
+    """
+    values as a typed buffer: array.array, numpy arrays and memoryviews are
+    returned as they are (no copy); anything else is packed into an
+    array.array of typecode (int64 by default).
+    """
+    if is_typed(values):
+        return values
+    return array(typecode, values)
+
+
+def as_numpy(arr):
+    """
+    Zero-copy numpy view of a typed buffer (writes go through to arr), or
+    None for a list or other sequence without a buffer.
+    """
+    import numpy as np
+
+    if _is_ndarray(arr):
+        return arr
+    if isinstance(arr, (array, memoryview)):
+        return np.asarray(memoryview(arr))
+    return None
+
+
+def scratch(arr, start=0, stop=None):
+    """A writable copy of arr[start:stop] of the same kind as arr."""
+    part = arr[start:stop]
+    if _is_ndarray(part):
+        return part.copy()
+    if isinstance(part, memoryview):
+        return memoryview(bytearray(part)).cast(part.format)
+    # list and array.array slices are already copies
+    return part
+
+
+def copy_of(arr):
+    """A writable copy of all of arr, of the same kind."""
+    return scratch(arr)
+
+
+def write_back(arr, start, values):
+    """arr[start:start + len(values)] = values, for a numpy values array and any kind of arr."""
+    stop = start + len(values)
+    if is_typed(arr):
+        as_numpy(arr)[start:stop] = values
+    else:
+        arr[start:stop] = values.tolist()
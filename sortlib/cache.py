@@ -0,0 +1,215 @@
+"""
+Bounded result cache in front of a search.
+
+SearchCache(search, table) behaves like `lambda t: search(table, t)` but
+remembers up to `capacity` (at least 1) results, so a hot target skips
+the search entirely. Eviction policy:
+  lru      least recently used
+  lfu      least frequently used (ties: least recently used)
+  tinylfu  LRU storage behind a TinyLFU admission filter: a new key only
+           displaces the LRU victim if a count-min sketch of recent
+           requests says it is asked for more often, so one-off scans do
+           not flush the hot set
+
+Results are dropped when the table changes: tables with a `version`
+attribute (SortedIndex) are checked on every call, anything else needs an
+explicit invalidate() after mutation. Counters: hits, misses, evictions,
+invalidations, plus total time spent answering hits and misses.
+"""
+
+import time
+from collections import OrderedDict
+
+CAPACITY = 1024
+
+
+class _LRU:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = OrderedDict()
+
+    def get(self, key, default):
+        if key in self.data:
+            self.data.move_to_end(key)
+            return self.data[key]
+        return default
+
+    def put(self, key, value):
+        """Stores key; returns True if another key was evicted for it."""
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.capacity:
+            self.data.popitem(last=False)
+            return True
+        return False
+
+    def clear(self):
+        self.data.clear()
+
+
+class _LFU:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = {}  # key -> (value, freq)
+        self.by_freq = {}  # freq -> OrderedDict of keys, oldest first
+        self.min_freq = 0
+
+    def _bump(self, key, value, freq):
+        bucket = self.by_freq[freq]
+        del bucket[key]
+        if not bucket:
+            del self.by_freq[freq]
+            if self.min_freq == freq:
+                self.min_freq = freq + 1
+        self.data[key] = (value, freq + 1)
+        self.by_freq.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def get(self, key, default):
+        entry = self.data.get(key)
+        if entry is None:
+            return default
+        self._bump(key, *entry)
+        return entry[0]
+
+    def put(self, key, value):
+        if key in self.data:
+            self._bump(key, value, self.data[key][1])
+            return False
+        evicted = False
+        if len(self.data) >= self.capacity:
+            victim, _ = self.by_freq[self.min_freq].popitem(last=False)
+            if not self.by_freq[self.min_freq]:
+                del self.by_freq[self.min_freq]
+            del self.data[victim]
+            evicted = True
+        self.data[key] = (value, 1)
+        self.by_freq.setdefault(1, OrderedDict())[key] = None
+        self.min_freq = 1
+        return evicted
+
+    def clear(self):
+        self.data.clear()
+        self.by_freq.clear()
+        self.min_freq = 0
+
+
+class _CountMin:
+    """
+    4-row count-min sketch, counters saturating at 15 and halved every
+    sample_size additions. The rows live in one flat list and take their
+    index from separate 16-bit slices of one well-mixed hash.
+    """
+
+    MAX_COUNT = 15
+
+    def __init__(self, width, sample_size):
+        self.width = min(width, 1 << 16)
+        self.counts = [0] * (4 * self.width)
+        self.sample_size = sample_size
+        self.additions = 0
+
+    def _slots(self, key):
+        h = hash((key,))  # tuple hashing mixes all bits, unlike hash(int)
+        w = self.width
+        return (h & 0xFFFF) % w, w + (h >> 16 & 0xFFFF) % w, \
+            2 * w + (h >> 32 & 0xFFFF) % w, 3 * w + (h >> 48 & 0xFFFF) % w
+
+    def add(self, key):
+        counts = self.counts
+        for i in self._slots(key):
+            if counts[i] < self.MAX_COUNT:
+                counts[i] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            # age: halve everything so old popularity fades
+            self.counts = [c >> 1 for c in counts]
+            self.additions //= 2
+
+    def estimate(self, key):
+        counts = self.counts
+        a, b, c, d = self._slots(key)
+        return min(counts[a], counts[b], counts[c], counts[d])
+
+    def clear(self):
+        self.counts = [0] * (4 * self.width)
+        self.additions = 0
+
+
+class _TinyLFU(_LRU):
+    def __init__(self, capacity):
+        super().__init__(capacity)
+        self.sketch = _CountMin(max(16, 4 * capacity), 10 * capacity)
+
+    def get(self, key, default):
+        self.sketch.add(key)
+        return super().get(key, default)
+
+    def put(self, key, value):
+        if key not in self.data and len(self.data) >= self.capacity:
+            victim = next(iter(self.data))
+            if self.sketch.estimate(key) <= self.sketch.estimate(victim):
+                return False  # not admitted; the victim stays
+        return super().put(key, value)
+
+    def clear(self):
+        super().clear()
+        self.sketch.clear()
+
+
+POLICIES = {"lru": _LRU, "lfu": _LFU, "tinylfu": _TinyLFU}
+
+_MISSING = object()
+
+
+class SearchCache:
+    def __init__(self, search, table, capacity=CAPACITY, policy="lru"):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy!r}, expected one of {sorted(POLICIES)}")
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.search = search
+        self.table = table
+        self.policy = policy
+        self.store = POLICIES[policy](capacity)
+        self.version = getattr(table, "version", None)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.hit_time = 0.0
+        self.miss_time = 0.0
+
+    def __call__(self, target):
+        t0 = time.perf_counter()
+        version = getattr(self.table, "version", None)
+        if version != self.version:
+            self.invalidate()
+            self.version = version
+        result = self.store.get(target, _MISSING)
+        if result is not _MISSING:
+            self.hits += 1
+            self.hit_time += time.perf_counter() - t0
+            return result
+        result = self.search(self.table, target)
+        self.evictions += self.store.put(target, result)
+        self.misses += 1
+        self.miss_time += time.perf_counter() - t0
+        return result
+
+    def invalidate(self):
+        """Forgets every cached result (call after mutating a table without a version)."""
+        self.store.clear()
+        self.invalidations += 1
+
+    def stats(self):
+        calls = self.hits + self.misses
+        return {
+            "policy": self.policy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / calls if calls else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "mean_hit_us": self.hit_time / self.hits * 1e6 if self.hits else 0.0,
+            "mean_miss_us": self.miss_time / self.misses * 1e6 if self.misses else 0.0,
+        }
@@ -0,0 +1,192 @@
+"""
+Operation counts for any algorithm in the package, without counted copies.
+
+count() wraps every element in a Key proxy whose comparison operators bump
+a shared counter, and the array in a CountingList that records element
+reads, writes (moves) and swaps. Recursion depth is tracked with a
+profile hook for the duration of the call. The algorithms themselves are
+untouched, so there is no overhead at all when nothing is being counted.
+
+Counted:
+  comparisons  every <, <=, >, >=, ==, != involving a Key
+  reads        arr[i] reads (slices count one read per element)
+  moves        elements written into arr or copied out of it by slicing /
+               copy(), i.e. everything an algorithm shifts or buffers
+  swaps        two consecutive writes that exchange a pair of elements, as
+               in a[i], a[j] = a[j], a[i]. An insertion that shifts one
+               element up and drops the key into its slot is the same
+               exchange and counts as one; longer shifts are only moves.
+               Ex5 compares insertion sorts by comparisons and moves.
+  max_depth    deepest recursion of any single function
+"""
+
+import sys
+
+
+class Counter:
+    __slots__ = ("comparisons", "reads", "moves", "swaps", "max_depth", "_last_write")
+
+    def __init__(self):
+        self.comparisons = 0
+        self.reads = 0
+        self.moves = 0
+        self.swaps = 0
+        self.max_depth = 0
+        self._last_write = None
+
+    def as_dict(self):
+        return {
+            "comparisons": self.comparisons,
+            "reads": self.reads,
+            "moves": self.moves,
+            "swaps": self.swaps,
+            "max_depth": self.max_depth,
+        }
+
+
+def _raw(x):
+    return x.value if type(x) is Key else x
+
+
+class Key:
+    """Element proxy that counts comparisons."""
+
+    __slots__ = ("value", "counter")
+
+    def __init__(self, value, counter):
+        self.value = value
+        self.counter = counter
+
+    def __lt__(self, other):
+        self.counter.comparisons += 1
+        return self.value < _raw(other)
+
+    def __le__(self, other):
+        self.counter.comparisons += 1
+        return self.value <= _raw(other)
+
+    def __gt__(self, other):
+        self.counter.comparisons += 1
+        return self.value > _raw(other)
+
+    def __ge__(self, other):
+        self.counter.comparisons += 1
+        return self.value >= _raw(other)
+
+    def __eq__(self, other):
+        self.counter.comparisons += 1
+        return self.value == _raw(other)
+
+    def __ne__(self, other):
+        self.counter.comparisons += 1
+        return self.value != _raw(other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __repr__(self):
+        return f"Key({self.value!r})"
+
+
+class CountingList(list):
+    """list that counts element reads, moves and swaps into a Counter."""
+
+    def __init__(self, values, counter):
+        super().__init__(values)
+        self.counter = counter
+
+    def __getitem__(self, index):
+        item = super().__getitem__(index)
+        if isinstance(index, slice):
+            self.counter.reads += len(item)
+            self.counter.moves += len(item)
+            return CountingList(item, self.counter)
+        self.counter.reads += 1
+        return item
+
+    def __setitem__(self, index, value):
+        c = self.counter
+        if isinstance(index, slice):
+            value = list(value)
+            c.moves += len(value)
+            c._last_write = None
+            super().__setitem__(index, value)
+            return
+        if index < 0:
+            index += len(self)
+        old = super().__getitem__(index)
+        c.moves += 1
+        last = c._last_write
+        if (last is not None and last[0] is self and last[1] != index
+                and last[2] is value and last[3] is old):
+            # (i: a -> b) then (j: b -> a)
+            c.swaps += 1
+            c._last_write = None
+        else:
+            c._last_write = (self, index, old, value)
+        super().__setitem__(index, value)
+
+    def __iter__(self):
+        for item in list.__iter__(self):
+            self.counter.reads += 1
+            yield item
+
+    def copy(self):
+        self.counter.reads += len(self)
+        self.counter.moves += len(self)
+        return CountingList(self, self.counter)
+
+
+def _depth_hook(counter):
+    depths = {}
+
+    def hook(frame, event, arg):
+        if event == "call":
+            code = frame.f_code
+            d = depths.get(code, 0) + 1
+            depths[code] = d
+            if d > counter.max_depth:
+                counter.max_depth = d
+        elif event == "return":
+            code = frame.f_code
+            depths[code] = depths.get(code, 1) - 1
+
+    return hook
+
+
+def _unwrap(result):
+    if isinstance(result, list):
+        return [_raw(x) for x in list.__iter__(result)]
+    if isinstance(result, tuple):
+        return tuple(_unwrap(x) for x in result)
+    return _raw(result)
+
+
+_NO_TARGET = object()
+
+
+def count(fn, arr, *args, target=_NO_TARGET):
+    """
+    Runs fn(counted_arr, *args) and returns (result, counts dict); arr
+    itself is not modified. For searches pass target=..., which is wrapped
+    so comparisons against it are counted and becomes fn's second argument:
+    fn(counted_arr, target, *args).
+
+    A function whose choices depend on the element types (hybrid_sort) can
+    carry a count_kwargs(arr, *args) attribute; it sees the raw values and
+    returns extra keyword arguments that pin those choices for the counted
+    run, or raises if the run cannot be counted.
+    """
+    kwargs = fn.count_kwargs(arr, *args) if hasattr(fn, "count_kwargs") else {}
+    counter = Counter()
+    wrapped = CountingList((Key(v, counter) for v in arr), counter)
+    if target is not _NO_TARGET:
+        args = (Key(target, counter),) + args
+    old_profile = sys.getprofile()
+    sys.setprofile(_depth_hook(counter))
+    try:
+        result = fn(wrapped, *args, **kwargs)
+    finally:
+        sys.setprofile(old_profile)
+    counts = counter.as_dict()
+    return _unwrap(result), counts
@@ -0,0 +1,151 @@
+"""
+Out-of-core sorting for key sets that do not fit in memory.
+
+external_sort() reads its input in chunks sized to a memory budget, sorts
+each chunk with a registered sort (merge_sort by default), spills it to a
+temporary run file, then k-way merges the runs with heapq.merge through
+buffered reads. Runs and the output use the same compact format: raw
+native-endian int64 (array('q')), 8 bytes per key.
+
+open_sorted() maps such a file into memory as a read-only sequence of
+ints, so the searches in sortlib.search work on it directly without
+loading it.
+"""
+
+import heapq
+import itertools
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+
+from sortlib.registry import get
+
+TYPECODE = "q"
+ITEM_SIZE = array(TYPECODE).itemsize
+
+# Default memory budget for external_sort, in bytes.
+DEFAULT_MEMORY = 64 * 1024 * 1024
+
+# Rough bytes per key while a chunk is sorted: list slot plus int object,
+# plus the merge buffer's slot.
+BYTES_PER_KEY = 48
+
+# Most runs merged at once; more than this are merged in several passes.
+MAX_FAN_IN = 64
+
+
+def write_ints(values, f, buffer_items=1 << 16):
+    """Appends the ints in values to the binary file object f; returns the count."""
+    count = 0
+    it = iter(values)
+    while True:
+        block = array(TYPECODE, itertools.islice(it, buffer_items))
+        if not block:
+            return count
+        block.tofile(f)
+        count += len(block)
+
+
+def read_ints(path, buffer_items=1 << 16):
+    """Yields the ints stored in a binary key file, reading buffer_items at a time."""
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(buffer_items * ITEM_SIZE)
+            if not data:
+                return
+            yield from array(TYPECODE, data)
+
+
+def _spill_runs(values, chunk_len, kernel, tmp_dir):
+    runs = []
+    it = iter(values)
+    while True:
+        chunk = list(itertools.islice(it, chunk_len))
+        if not chunk:
+            return runs
+        path = os.path.join(tmp_dir, f"run{len(runs)}.bin")
+        with open(path, "wb") as f:
+            write_ints(get(kernel)(chunk), f)
+        runs.append(path)
+        del chunk
+
+
+def _merge_runs(runs, out_path, memory):
+    # one read buffer per run plus one for the output
+    buffer_items = max(1024, memory // ((len(runs) + 1) * BYTES_PER_KEY))
+    with open(out_path, "wb") as out:
+        return write_ints(heapq.merge(*(read_ints(p, buffer_items) for p in runs)),
+                          out, buffer_items)
+
+
+def external_sort(values, out_path, memory=DEFAULT_MEMORY, kernel="merge",
+                  tmp_dir=None, fan_in=MAX_FAN_IN):
+    """
+    Sorts an iterable of ints (each within int64) into the binary key file
+    out_path, holding at most about `memory` bytes of keys at a time.
+    Returns the number of keys written.
+    """
+    chunk_len = max(1, memory // BYTES_PER_KEY)
+    work = tempfile.mkdtemp(prefix="sortlib-", dir=tmp_dir)
+    try:
+        runs = _spill_runs(values, chunk_len, kernel, work)
+        level = 0
+        while len(runs) > fan_in:
+            merged = []
+            for i in range(0, len(runs), fan_in):
+                path = os.path.join(work, f"merge{level}_{i}.bin")
+                _merge_runs(runs[i:i + fan_in], path, memory)
+                for p in runs[i:i + fan_in]:
+                    os.remove(p)
+                merged.append(path)
+            runs = merged
+            level += 1
+
+        if len(runs) == 1:
+            shutil.move(runs[0], out_path)
+            return os.path.getsize(out_path) // ITEM_SIZE
+        if not runs:
+            open(out_path, "wb").close()
+            return 0
+        return _merge_runs(runs, out_path, memory)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def open_sorted(path):
+    """
+    Read-only sequence view of a binary key file (memory-mapped), usable
+    with binary_search/lower_bound like a list.
+    """
+    if os.path.getsize(path) == 0:
+        return memoryview(array(TYPECODE))
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(TYPECODE)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from sortlib.search import binary_search
+
+    n = 5_000_000
+    rng = random.Random(338)
+    out = os.path.join(tempfile.gettempdir(), "sortlib_external_demo.bin")
+
+    t0 = time.perf_counter()
+    count = external_sort((rng.randrange(10 * n) for _ in range(n)), out,
+                          memory=16 * 1024 * 1024)
+    t1 = time.perf_counter()
+    print(f"external_sort: {count:,} keys with a 16 MiB budget in {t1 - t0:.1f}s "
+          f"({os.path.getsize(out) / 2**20:.0f} MiB on disk)")
+
+    keys = open_sorted(out)
+    assert all(keys[i] <= keys[i + 1] for i in range(0, len(keys) - 1, 9973))
+    hits = sum(binary_search(keys, rng.randrange(10 * n)) for _ in range(10_000))
+    print(f"binary_search on the mapped file: {hits} of 10,000 random keys present")
+    keys.release()
+    os.remove(out)
@@ -0,0 +1,164 @@
+"""
+Adaptive sort: look at the input, then pick the algorithm that suits it.
+
+probe() takes a cheap O(sample) look at the input (size, how often a
+sampled neighbour pair is out of order, how many sampled values repeat),
+and choose() turns that into one of the package's sorts using thresholds
+that come from a calibration file. The file is written by
+sortlib.bench.calibrate (run by Ex2's driver), so the switch points match
+the machine the benchmarks ran on rather than numbers picked on a laptop.
+Integer lists are checked first and go to counting or radix sort when
+their range or size makes that pay off. Missing entries fall back to
+DEFAULT_THRESHOLDS.
+"""
+
+import importlib.util
+import json
+import os
+import random
+
+from sortlib.buffers import as_numpy, is_typed
+from sortlib.merge import merge_sort
+from sortlib.quick import quicksort
+from sortlib.radix import counting_sort, radix_sort
+from sortlib.simple import binary_insertion_sort_range
+
+CALIBRATION_PATH = os.environ.get(
+    "SORTLIB_CALIBRATION",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sort_calibration.json"),
+)
+
+# Used for anything the calibration file does not set.
+DEFAULT_THRESHOLDS = {
+    # at or below this n, block insertion sort beats quicksort
+    "insertion_max": 16,
+    # at or below this fraction of out-of-order neighbour pairs, merge_sort's
+    # run detection beats quicksort
+    "presorted_max_disorder": 0.02,
+    # at or above this fraction of repeated sampled values, quicksort's
+    # three-way partition beats the two-way one
+    "three_way_min_dups": 0.5,
+    # integer input: counting sort while (max - min) <= this * n ...
+    "counting_max_span_ratio": 1.0,
+    # ... otherwise radix sort from this n up (needs numpy)
+    "radix_min_n": 128,
+}
+
+# Pairs / values looked at by probe().
+PROBE_SAMPLE = 64
+
+_HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+
+_loaded = {}
+
+
+def load_thresholds(path=None):
+    """DEFAULT_THRESHOLDS updated with the calibration file, if it exists."""
+    path = os.path.abspath(path or CALIBRATION_PATH)
+    if path not in _loaded:
+        thresholds = dict(DEFAULT_THRESHOLDS)
+        try:
+            with open(path) as f:
+                thresholds.update(json.load(f).get("thresholds", {}))
+        except FileNotFoundError:
+            pass
+        _loaded[path] = thresholds
+    return _loaded[path]
+
+
+def save_thresholds(thresholds, measurements=None, path=None):
+    """Writes a calibration file; measurements are stored alongside for reference."""
+    path = os.path.abspath(path or CALIBRATION_PATH)
+    with open(path, "w") as f:
+        json.dump({"thresholds": thresholds, "measurements": measurements or {}},
+                  f, indent=2, sort_keys=True)
+    _loaded.pop(path, None)
+
+
+def probe(arr, sample=PROBE_SAMPLE, seed=0):
+    """
+    Returns {"n", "disorder", "dups"}: the fraction of sampled neighbour
+    pairs (arr[i], arr[i + 1]) that are out of order, and the fraction of
+    sampled values that repeat another sampled value.
+    """
+    n = len(arr)
+    if n < 2:
+        return {"n": n, "disorder": 0.0, "dups": 0.0}
+    rng = random.Random(seed)
+    k = min(sample, n - 1)
+    starts = rng.sample(range(n - 1), k)
+    disorder = sum(1 for i in starts if arr[i + 1] < arr[i]) / k
+    values = [arr[i] for i in starts]
+    dups = 1 - len(set(values)) / k
+    return {"n": n, "disorder": disorder, "dups": dups}
+
+
+def _int_range(arr):
+    """(min, max) if every element is an int, else None."""
+    if is_typed(arr):
+        if not _HAVE_NUMPY:
+            return None
+        view = as_numpy(arr)
+        if view.dtype.kind not in "iu":
+            return None
+        return int(view.min()), int(view.max())
+    if not all(type(v) is int for v in arr):
+        return None
+    return min(arr), max(arr)
+
+
+def choose(arr, thresholds=None):
+    """Name of the algorithm hybrid_sort would use on arr."""
+    t = thresholds or load_thresholds()
+    n = len(arr)
+    if n <= t["insertion_max"]:
+        return "insertion"
+    bounds = _int_range(arr)
+    if bounds is not None:
+        lo, hi = bounds
+        if hi - lo <= t["counting_max_span_ratio"] * n:
+            return "counting"
+        if n >= t["radix_min_n"] and -2**63 <= lo and hi < 2**63 and _HAVE_NUMPY:
+            return "radix"
+    p = probe(arr)
+    if p["disorder"] <= t["presorted_max_disorder"]:
+        return "merge"
+    if p["dups"] >= t["three_way_min_dups"]:
+        return "quick3"
+    return "quick"
+
+
+def hybrid_sort(arr, thresholds=None, algo=None):
+    """
+    Sorts arr in place with the algorithm choose() picks (or algo, a name
+    choose() can return); returns arr.
+    """
+    algo = algo or choose(arr, thresholds)
+    if algo == "insertion":
+        if len(arr) > 1:
+            binary_insertion_sort_range(arr, 0, len(arr) - 1)
+        return arr
+    if algo == "merge":
+        return merge_sort(arr)
+    if algo == "counting":
+        return counting_sort(arr)
+    if algo == "radix":
+        return radix_sort(arr)
+    return quicksort(arr, three_way=True if algo == "quick3" else None)
+
+
+def _count_kwargs(arr, thresholds=None):
+    """
+    sortlib.counting.count() hook: under count() the elements are Key
+    proxies, which would hide that they are ints and change the dispatch,
+    so the choice is made here on the raw values. The counts then cover
+    the chosen sort, not the probe.
+    """
+    algo = choose(arr, thresholds)
+    if algo in ("counting", "radix"):
+        raise ValueError(f"hybrid_sort picks {algo} sort for this input, which does not "
+                         f"compare elements, so count() cannot instrument it")
+    return {"algo": algo}
+
+
+hybrid_sort.count_kwargs = _count_kwargs
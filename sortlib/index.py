@@ -0,0 +1,138 @@
+"""
+Sort-once, query-many lookups.
+
+SortedIndex keeps the values in a list of small sorted blocks (like a
+one-level B-tree): queries bisect the block maxima, then the block, so
+contains/rank are O(log n), and insert/delete only shift one block.
+
+plan_lookups() decides whether building an index pays off for a given
+number of queries, or whether a plain linear scan per query is cheaper.
+"""
+
+import math
+from bisect import bisect_left, bisect_right, insort
+
+from sortlib.cache import CAPACITY, SearchCache
+from sortlib.quick import quicksort
+from sortlib.search import linear_search
+
+# Blocks are split when they reach 2 * BLOCK_SIZE elements.
+BLOCK_SIZE = 512
+
+# Rough per-operation costs (nanoseconds) of the pure-Python code paths,
+# measured on CPython 3.11; only their ratios matter to the planner.
+LINEAR_NS_PER_ELEM = 40
+SORT_NS_PER_NLOGN = 120
+INDEX_NS_PER_QUERY = 500
+
+
+class SortedIndex:
+    def __init__(self, values=(), block_size=BLOCK_SIZE):
+        self.block_size = block_size
+        data = list(values)
+        quicksort(data)
+        self.blocks = [data[i:i + block_size] for i in range(0, len(data), block_size)]
+        self.maxes = [b[-1] for b in self.blocks]
+        self.size = len(data)
+        self._offsets = None
+        self.version = 0  # bumped on every mutation (see sortlib.cache)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for block in self.blocks:
+            yield from block
+
+    def __contains__(self, value):
+        return self.contains(value)
+
+    def _locate(self, value):
+        """(block number, index in block) of the first element >= value."""
+        b = bisect_left(self.maxes, value)
+        if b == len(self.blocks):
+            return b, 0
+        return b, bisect_left(self.blocks[b], value)
+
+    def contains(self, value):
+        b, i = self._locate(value)
+        return b < len(self.blocks) and self.blocks[b][i] == value
+
+    def rank(self, value):
+        """Number of stored elements strictly less than value."""
+        b, i = self._locate(value)
+        if self._offsets is None:
+            offsets = [0]
+            for block in self.blocks:
+                offsets.append(offsets[-1] + len(block))
+            self._offsets = offsets
+        return self._offsets[b] + i
+
+    def insert(self, value):
+        self._offsets = None
+        self.version += 1
+        self.size += 1
+        if not self.blocks:
+            self.blocks.append([value])
+            self.maxes.append(value)
+            return
+        b = bisect_right(self.maxes, value)
+        if b == len(self.blocks):
+            b -= 1
+            self.blocks[b].append(value)
+            self.maxes[b] = value
+        else:
+            insort(self.blocks[b], value)
+        block = self.blocks[b]
+        if len(block) >= 2 * self.block_size:
+            half = len(block) // 2
+            self.blocks[b:b + 1] = [block[:half], block[half:]]
+            self.maxes[b:b + 1] = [block[half - 1], block[-1]]
+
+    def delete(self, value):
+        """Removes one occurrence of value; raises ValueError if it is absent."""
+        b, i = self._locate(value)
+        if b == len(self.blocks) or self.blocks[b][i] != value:
+            raise ValueError(f"{value!r} not in index")
+        self._offsets = None
+        self.version += 1
+        self.size -= 1
+        block = self.blocks[b]
+        del block[i]
+        if not block:
+            del self.blocks[b]
+            del self.maxes[b]
+        else:
+            self.maxes[b] = block[-1]
+
+
+def lookup_costs(n, queries, hit_rate=1.0):
+    """Estimated nanoseconds for (linear scans, index build + queries)."""
+    # a hit stops halfway on average, a miss scans everything
+    scanned = n * (0.5 * hit_rate + (1.0 - hit_rate))
+    linear = queries * scanned * LINEAR_NS_PER_ELEM
+    log_n = math.log2(n) if n > 1 else 1.0
+    index = n * log_n * SORT_NS_PER_NLOGN + queries * INDEX_NS_PER_QUERY
+    return linear, index
+
+
+def plan_lookups(n, queries, hit_rate=1.0):
+    """Returns "linear" or "index", whichever is expected to be cheaper."""
+    linear, index = lookup_costs(n, queries, hit_rate)
+    return "linear" if linear <= index else "index"
+
+
+def make_lookup(arr, queries, hit_rate=1.0, cache=None, capacity=CAPACITY):
+    """
+    Returns a contains(target) function for arr, backed by linear search or
+    by a SortedIndex depending on plan_lookups(). With cache set to a
+    sortlib.cache policy name, results are memoized in a SearchCache (of
+    capacity targets) in front of it, which is then what is returned.
+    """
+    if plan_lookups(len(arr), queries, hit_rate) == "linear":
+        search, table = linear_search, arr
+    else:
+        search, table = SortedIndex.contains, SortedIndex(arr)
+    if cache is not None:
+        return SearchCache(search, table, capacity, cache)
+    return lambda target: search(table, target)
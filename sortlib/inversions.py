@@ -0,0 +1,193 @@
+"""
+Inversion counting: exact bubble-sort statistics without running bubble sort.
+
+Every swap bubble sort makes exchanges one adjacent out-of-order pair, so
+its swap count is the number of inversions (pairs i < j with a[i] > a[j]),
+and its comparison count is always n(n-1)/2. Both follow from one
+O(n log n) merge-sort pass over the input instead of the O(n^2) simulation
+in sortlib.simple.bubble_sort_with_counts.
+
+Per-pass figures come from the inversion table: b[j] is the number of
+larger elements before a[j]. Each bubble-sort pass lowers every non-zero
+b[j] by one (Knuth, TAOCP 5.2.2), so pass k swaps exactly the elements with
+b[j] >= k, and the input is sorted after max(b) passes.
+
+Numeric inputs use a numpy bottom-up merge (one stable sort per level,
+which numpy runs as a linear merge of each pair of sorted runs); other
+inputs, or no numpy, use a pure-Python merge sort. The inversion table
+costs an extra gather per level, so it is only built for per-pass stats. numpy is imported inside the
+functions that need it.
+"""
+
+import importlib.util
+
+_HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def _left_greater_merge(arr):
+    """Inversion table b as a list, by a pure-Python merge sort."""
+    n = len(arr)
+    b = [0] * n
+    items = [(v, i) for i, v in enumerate(arr)]
+    width = 1
+    while width < n:
+        merged = []
+        for start in range(0, n, 2 * width):
+            left = items[start:start + width]
+            right = items[start + width:start + 2 * width]
+            i = j = 0
+            while i < len(left) and j < len(right):
+                if right[j][0] < left[i][0]:
+                    # every left element still waiting is larger
+                    b[right[j][1]] += len(left) - i
+                    merged.append(right[j])
+                    j += 1
+                else:
+                    merged.append(left[i])
+                    i += 1
+            merged.extend(left[i:])
+            merged.extend(right[j:])
+        items = merged
+        width *= 2
+    return b
+
+
+def _dense_keys(values):
+    """(keys, m): non-negative int64 keys in the same order as values, all < m."""
+    import numpy as np
+
+    # small int ranges are used as they are, so (block, key) packs into an int64
+    if values.dtype.kind in "iu":
+        lo = int(values.min())
+        span = int(values.max()) - lo
+        if (span + 1) * len(values) < 2**61:
+            return values.astype(np.int64) - lo, span + 1
+    _, keys = np.unique(values, return_inverse=True)
+    keys = keys.astype(np.int64).ravel()
+    return keys, int(keys.max()) + 1
+
+
+def _inversions_numpy(values):
+    """Inversion count by a vectorized bottom-up merge."""
+    import numpy as np
+
+    values = np.asarray(values)
+    n = len(values)
+    if n < 2:
+        return 0
+    keys, m = _dense_keys(values)
+    pos = np.arange(n, dtype=np.int64)
+    total = 0
+    width = 1
+    while width < n:
+        shift = width.bit_length()
+        block = pos >> shift
+        # (pair, key, run) packed in one int64: sorting merges each pair of
+        # runs, with equal keys from the left run first; numpy's stable sort
+        # finds the sorted runs, so this is a linear merge
+        packed = ((block * m + keys) << 1) | ((pos >> (shift - 1)) & 1)
+        packed.sort(kind="stable")
+        right = packed & 1
+        keys = (packed >> 1) - block * m
+        # a right-run element that moves from offset k of its run to offset
+        # p of the merged pair has p - k left elements before it, so the
+        # other width - (p - k) are larger: sum width - p here and k below
+        total += int(right.sum()) * width - int(right @ (pos & (2 * width - 1)))
+        full, rest = divmod(n, 2 * width)
+        last = max(rest - width, 0)
+        total += full * (width * (width - 1) // 2) + last * (last - 1) // 2
+        width *= 2
+    return total
+
+
+def _left_greater_numpy(values):
+    """Inversion table b as an int64 array, the same merge tracking every element."""
+    import numpy as np
+
+    values = np.asarray(values)
+    n = len(values)
+    b = np.zeros(n, dtype=np.int64)
+    if n < 2:
+        return b
+    keys, m = _dense_keys(values)
+
+    # b is kept in merged order and put back in input order at the end;
+    # positions are split by bit tests because run widths are powers of two
+    sort_order = np.argsort(keys, kind="stable")
+    pos = np.arange(n, dtype=np.int64)
+    width = 1
+    while width < n:
+        order = np.argsort((pos >> width.bit_length()) * m + keys, kind="stable")
+        keys = keys[order]
+        b = b[order]
+        p = np.flatnonzero(order & width)
+        k = order[p] & (width - 1)
+        b[p] += width - ((p & (2 * width - 1)) - k)
+        width *= 2
+    out = np.empty_like(b)
+    out[sort_order] = b
+    return out
+
+
+def _numeric(arr):
+    if not _HAVE_NUMPY:
+        return False
+    import numpy as np
+
+    try:
+        return np.asarray(arr).dtype.kind in "iuf"
+    except (TypeError, ValueError):
+        return False
+
+
+def inversion_table(arr):
+    """b[j] = number of elements before arr[j] that are larger than it."""
+    if _numeric(arr):
+        return _left_greater_numpy(arr)
+    return _left_greater_merge(arr)
+
+
+def _total(b):
+    return sum(b) if isinstance(b, list) else int(b.sum())
+
+
+def count_inversions(arr):
+    """Number of pairs i < j with arr[i] > arr[j], in O(n log n)."""
+    if _numeric(arr):
+        return _inversions_numpy(arr)
+    return sum(_left_greater_merge(arr))
+
+
+def bubble_stats(arr, per_pass=False):
+    """
+    What bubble_sort_with_counts(arr) would count, without sorting:
+    {"comparisons", "swaps"}. With per_pass, also "pass_swaps" (swaps made
+    by each pass, up to the last pass that swaps anything) and "passes"
+    (how many passes it takes until the array is sorted).
+    """
+    n = len(arr)
+    stats = {"comparisons": n * (n - 1) // 2}
+    if not per_pass:
+        stats["swaps"] = count_inversions(arr)
+    else:
+        b = inversion_table(arr)
+        stats["swaps"] = _total(b)
+        if not isinstance(b, list):
+            import numpy as np
+
+            # pass k swaps the elements with b >= k
+            at_least = np.cumsum(np.bincount(b)[::-1])[::-1]
+            pass_swaps = at_least[1:].tolist()
+        else:
+            hist = [0] * (max(b, default=0) + 1)
+            for x in b:
+                hist[x] += 1
+            pass_swaps = []
+            running = 0
+            for c in reversed(hist[1:]):
+                running += c
+                pass_swaps.append(running)
+            pass_swaps.reverse()
+        stats["pass_swaps"] = pass_swaps
+        stats["passes"] = len(pass_swaps)
+    return stats
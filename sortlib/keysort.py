@@ -0,0 +1,191 @@
+"""
+Sorting records by key fields without moving the records.
+
+The sorts in sortlib compare and move bare values. To order records
+(tuples, dicts, objects) by one or more fields, lexsort() pulls the key
+columns out once (struct-of-arrays), turns them into one non-negative int
+code per record that preserves the lexicographic order of the columns,
+packs that code together with the record's index into a single int
+(code << bits | index) and sorts those ints with any registered sort. The
+index in the low bits breaks ties, so the result is stable whichever sort
+does the work, and the sort only ever moves small ints. The permutation
+comes back as an int32 (int64 from 2**31 records) array.array.
+
+Int columns are offset by their minimum; other columns (floats, strings,
+...) are replaced by their rank among the distinct values. A descending
+column uses max - key, so equal keys still keep their input order.
+
+The permutation is then applied once: apply_permutation() builds the
+sorted sequence, permute() rearranges a list or buffer in place by
+following cycles (O(n) moves, no second copy), and SortedView reads
+through the permutation lazily. sort_records() does all of it from key
+functions or field names.
+"""
+
+from array import array
+from operator import itemgetter
+
+from sortlib.buffers import as_numpy, is_typed
+from sortlib.registry import get
+
+MODES = ("copy", "in_place", "lazy")
+
+
+def _values(column):
+    if is_typed(column):
+        return as_numpy(column).tolist()
+    return list(column)
+
+
+def _codes(values, reverse):
+    """(codes, m): ints in [0, m) ordered like values (descending if reverse)."""
+    if all(type(v) is int or type(v) is bool for v in values):
+        lo, hi = (min(values), max(values)) if values else (0, 0)
+        if reverse:
+            return [hi - v for v in values], hi - lo + 1
+        return [v - lo for v in values], hi - lo + 1
+    distinct = get("merge")(list(set(values)))
+    top = len(distinct) - 1
+    rank = {v: (top - i if reverse else i) for i, v in enumerate(distinct)}
+    return [rank[v] for v in values], len(distinct)
+
+
+def index_typecode(n):
+    """array.array typecode for indices into n records."""
+    return "i" if n < 2**31 else "q"
+
+
+def lexsort(columns, reverse=False, algorithm="hybrid"):
+    """
+    Stable permutation that orders records by columns[0], then columns[1],
+    ... (each column holds one key per record). reverse is one flag for
+    every column or a list with one per column. algorithm is a registered
+    sort name.
+    """
+    columns = [_values(c) for c in columns]
+    if not columns:
+        raise ValueError("lexsort needs at least one key column")
+    n = len(columns[0])
+    if any(len(c) != n for c in columns):
+        raise ValueError("key columns must all have the same length")
+    flags = reverse if isinstance(reverse, (list, tuple)) else [reverse] * len(columns)
+    if len(flags) != len(columns):
+        raise ValueError("reverse needs one flag per key column")
+
+    # mixed-radix code: column k is a digit in base m_k, first column most
+    # significant
+    combined = None
+    for values, flag in zip(columns, flags):
+        codes, m = _codes(values, flag)
+        combined = codes if combined is None else [a * m + c for a, c in zip(combined, codes)]
+
+    shift = max(n - 1, 0).bit_length()
+    packed = [(c << shift) | i for i, c in enumerate(combined)]
+    packed = get(algorithm)(packed)
+    mask = (1 << shift) - 1
+    return array(index_typecode(n), [p & mask for p in packed])
+
+
+def argsort(column, reverse=False, algorithm="hybrid"):
+    """Stable permutation that sorts one key column: column[perm[0]] is the smallest."""
+    return lexsort([column], reverse, algorithm)
+
+
+def apply_permutation(records, perm):
+    """[records[i] for i in perm], as a numpy array when records is a typed buffer."""
+    if is_typed(records):
+        return as_numpy(records)[as_numpy(perm)]
+    return [records[i] for i in perm]
+
+
+def permute(arr, perm):
+    """Rearranges arr in place so that arr[k] becomes the old arr[perm[k]]; returns arr."""
+    n = len(arr)
+    done = bytearray(n)
+    for start in range(n):
+        if done[start]:
+            continue
+        first = arr[start]
+        j = start
+        while True:
+            done[j] = 1
+            nxt = perm[j]
+            if nxt == start:
+                arr[j] = first
+                break
+            arr[j] = arr[nxt]
+            j = nxt
+    return arr
+
+
+class SortedView:
+    """Read-only sequence of records in permutation order, fetched on access."""
+
+    def __init__(self, records, perm):
+        self.records = records
+        self.perm = perm
+
+    def __len__(self):
+        return len(self.perm)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SortedView(self.records, self.perm[index])
+        return self.records[self.perm[index]]
+
+    def __iter__(self):
+        records = self.records
+        for i in self.perm:
+            yield records[i]
+
+    def materialize(self):
+        """The records in order, as a list (or numpy array for a typed buffer)."""
+        return apply_permutation(self.records, self.perm)
+
+
+def sort_records(records, key, reverse=False, mode="copy", algorithm="hybrid"):
+    """
+    Sorts records by key: a function, a field name / index (itemgetter), or
+    a list or tuple of them for lexicographic order. reverse as in
+    lexsort(). mode:
+      copy      return the sorted records (a new list)
+      in_place  rearrange records itself and return it
+      lazy      return a SortedView over the unchanged records
+    Always stable.
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}, expected one of {list(MODES)}")
+    keys = key if isinstance(key, (list, tuple)) else [key]
+    getters = [k if callable(k) else itemgetter(k) for k in keys]
+    perm = lexsort([[g(r) for r in records] for g in getters], reverse, algorithm)
+    if mode == "lazy":
+        return SortedView(records, perm)
+    if mode == "in_place":
+        return permute(records, perm)
+    return apply_permutation(records, perm)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from sortlib.merge import merge_sort
+
+    rng = random.Random(338)
+    n = 200_000
+    rows = [{"id": i, "dept": rng.choice(["eng", "ops", "hr", "fin"]),
+             "salary": rng.randint(30_000, 200_000), "notes": "x" * 50} for i in range(n)]
+
+    # baseline: decorate, merge-sort the (dept, -salary, index, row) tuples, undecorate
+    t0 = time.perf_counter()
+    decorated = [(r["dept"], -r["salary"], i, r) for i, r in enumerate(rows)]
+    merge_sort(decorated)
+    expected = [d[3] for d in decorated]
+    print(f"merge_sort on decorated tuples: {time.perf_counter() - t0:.2f}s")
+
+    for algorithm in ("merge", "quick", "hybrid"):
+        t0 = time.perf_counter()
+        result = sort_records(rows, ["dept", "salary"], reverse=[False, True], algorithm=algorithm)
+        elapsed = time.perf_counter() - t0
+        print(f"sort_records, {algorithm:6s} on packed keys: {elapsed:.2f}s  "
+              f"(same order: {result == expected})")
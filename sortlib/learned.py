@@ -0,0 +1,125 @@
+"""
+Value-aware searches on sorted numeric arrays.
+
+Ex7 shows that a good first guess is roughly proportional to the target's
+value. interpolation_search applies that guess at every step, and
+LearnedIndex fits a piecewise-linear key -> position model once and only
+binary-searches the model's error window.
+
+Every search returns (found, probes), probes being the number of array
+elements read, so they compare directly with search.binary_search_probes.
+"""
+
+from bisect import bisect_right
+
+from sortlib.search import binary_search_probes
+
+# Elements covered by one linear segment of a LearnedIndex.
+SEGMENT_SIZE = 256
+
+
+def interpolation_search(arr, target):
+    """
+    Interpolation search with a binary-search fallback: after two
+    interpolated probes in a row that fail to halve the remaining range, the
+    next probe is a plain midpoint. O(log log n) probes on near-uniform
+    data, and at most about three times binary search on skewed data.
+    """
+    n = len(arr)
+    if n == 0:
+        return False, 0
+
+    lo, hi = 0, n - 1
+    lo_v, hi_v = arr[lo], arr[hi]
+    probes = 2
+    if target < lo_v or target > hi_v:
+        return False, probes
+    if lo_v == target or hi_v == target:
+        return True, probes
+
+    # invariant: lo_v < target < hi_v, so any match lies strictly inside
+    misses = 0
+    while hi - lo > 1:
+        size = hi - lo
+        interpolated = misses < 2
+        if interpolated:
+            # int(): float keys or targets make the quotient a float
+            mid = lo + int((target - lo_v) * size // (hi_v - lo_v))
+            mid = max(lo + 1, min(hi - 1, mid))
+        else:
+            mid = (lo + hi) // 2
+            misses = 0
+        v = arr[mid]
+        probes += 1
+        if v == target:
+            return True, probes
+        if v < target:
+            lo, lo_v = mid, v
+        else:
+            hi, hi_v = mid, v
+        if interpolated:
+            misses = misses + 1 if hi - lo > size // 2 else 0
+
+    return False, probes
+
+
+class LearnedIndex:
+    """
+    Piecewise-linear model of position as a function of key over a sorted
+    array. Each segment stores its key range, slope and the largest
+    prediction error seen while fitting, so a lookup only has to search
+    [prediction - error, prediction + error].
+    """
+
+    def __init__(self, arr, segment_size=SEGMENT_SIZE):
+        self.arr = arr
+        self.first_keys = []
+        self.segments = []  # (start, end, first_key, slope, max_error)
+        n = len(arr)
+        for start in range(0, n, segment_size):
+            end = min(start + segment_size, n)
+            k0, k1 = arr[start], arr[end - 1]
+            slope = (end - 1 - start) / (k1 - k0) if k1 != k0 else 0.0
+            err = 0
+            for i in range(start, end):
+                pred = start + int((arr[i] - k0) * slope)
+                if abs(pred - i) > err:
+                    err = abs(pred - i)
+            self.first_keys.append(k0)
+            self.segments.append((start, end, k0, slope, err))
+
+    def predict(self, target):
+        """(predicted position, low, high) window that must hold target if present."""
+        s = bisect_right(self.first_keys, target) - 1
+        start, end, k0, slope, err = self.segments[max(s, 0)]
+        pred = start + int((target - k0) * slope)
+        low = max(start, pred - err)
+        high = min(end - 1, pred + err)
+        return pred, low, high
+
+    def search(self, target):
+        if not self.segments:
+            return False, 0
+        pred, low, high = self.predict(target)
+        return binary_search_probes(self.arr, target, pred, low, high)
+
+
+def compare_probes(arr, targets, segment_size=SEGMENT_SIZE):
+    """
+    Average and maximum probes per query for binary, interpolation and
+    learned-index search over the same sorted arr.
+    """
+    model = LearnedIndex(arr, segment_size)
+    searches = {
+        "binary": lambda x: binary_search_probes(arr, x),
+        "interpolation": lambda x: interpolation_search(arr, x),
+        "learned": model.search,
+    }
+    report = {}
+    for name, fn in searches.items():
+        counts = [fn(x)[1] for x in targets]
+        report[name] = {
+            "avg": sum(counts) / len(counts) if counts else 0.0,
+            "max": max(counts, default=0),
+        }
+    return report
@@ -0,0 +1,95 @@
+"""
+Loading large integer tables without a Python object per element.
+
+iter_json_blocks() parses a flat JSON array of integers a block at a
+time into array('q') blocks, so a file never has to be held (or its int
+objects built) all at once; load_json_ints() concatenates them, 8 bytes per
+element. sorted_keys() goes one step further for lookup tables: the first
+call sorts the JSON array into a binary int64 file next to it (the format
+of sortlib.external), and every later call just memory-maps that file, so
+start-up is bound by I/O rather than parsing.
+"""
+
+import json
+import os
+from array import array
+
+from sortlib.external import DEFAULT_MEMORY, TYPECODE, external_sort, open_sorted
+
+# Characters read per block while parsing.
+CHUNK_CHARS = 1 << 20
+
+
+def iter_json_blocks(path, chunk_chars=CHUNK_CHARS):
+    """
+    Parses a JSON file holding one flat array of ints, yielding the values
+    as consecutive array('q') blocks of roughly chunk_chars characters each.
+    """
+    with open(path) as f:
+        head = f.read(chunk_chars)
+        while head and not head.strip():
+            head = f.read(chunk_chars)
+        head = head.lstrip()
+        if not head.startswith("["):
+            raise ValueError(f"{path}: expected a JSON array")
+        buf = head[1:]
+        while True:
+            block = f.read(chunk_chars)
+            if not block:
+                break
+            buf += block
+            # everything up to the last comma is complete numbers
+            cut = buf.rfind(",")
+            if cut < 0:
+                continue
+            yield _parse(buf[:cut], path)
+            buf = buf[cut + 1:]
+
+    tail = buf.rstrip()
+    if not tail.endswith("]"):
+        raise ValueError(f"{path}: unterminated JSON array")
+    tail = tail[:-1]
+    if tail.strip():
+        yield _parse(tail, path)
+
+
+def _parse(text, path):
+    # json's C parser on the block, then straight into 8-byte slots
+    try:
+        return array(TYPECODE, json.loads(f"[{text}]"))
+    except (ValueError, TypeError, OverflowError):
+        raise ValueError(f"{path}: not an array of integers") from None
+
+
+def iter_json_ints(path, chunk_chars=CHUNK_CHARS):
+    """Yields the integers of a JSON file holding one flat array of ints."""
+    for block in iter_json_blocks(path, chunk_chars):
+        yield from block
+
+
+def load_json_ints(path, as_numpy=False):
+    """The JSON array in path as an array('q') (or a numpy int64 array sharing its buffer)."""
+    out = array(TYPECODE)
+    for block in iter_json_blocks(path):
+        out.extend(block)
+    if as_numpy:
+        import numpy as np
+
+        return np.frombuffer(out, dtype=np.int64)
+    return out
+
+
+def sorted_keys(json_path, cache_path=None, memory=DEFAULT_MEMORY):
+    """
+    The integers of json_path in sorted order, as a read-only memory-mapped
+    sequence. The sorted binary copy is kept at cache_path (default: the
+    JSON name with .sorted.bin) and rebuilt when the JSON file is newer.
+    """
+    if cache_path is None:
+        cache_path = os.path.splitext(json_path)[0] + ".sorted.bin"
+    if (not os.path.exists(cache_path)
+            or os.path.getmtime(cache_path) < os.path.getmtime(json_path)):
+        tmp = cache_path + ".tmp"
+        external_sort(iter_json_ints(json_path), tmp, memory=memory, kernel="hybrid")
+        os.replace(tmp, cache_path)
+    return open_sorted(cache_path)
@@ -0,0 +1,178 @@
+from array import array
+
+from sortlib.buffers import scratch
+from sortlib.simple import binary_insertion_sort_range
+
+# Runs shorter than this are extended with insertion sort before merging.
+MIN_RUN = 16
+# Block copies between arr and aux go at most this many elements at a time:
+# a list slice is a temporary copy, so one big slice would cost as much
+# memory as aux itself.
+COPY_CHUNK = 1024
+
+
+def merge_sort(arr, low=0, high=None):
+    """Sorts arr[low..high] in place (bottom-up, single auxiliary buffer)."""
+    return merge_sort_bottom_up(arr, low, high)
+
+
+def merge_sort_recursive(arr, low=0, high=None):
+    """Original top-down version from Ex1, kept for comparison."""
+    if high is None:
+        high = len(arr) - 1
+    if low < high:
+        mid = (low + high) // 2
+        merge_sort_recursive(arr, low, mid)
+        merge_sort_recursive(arr, mid + 1, high)
+        merge(arr, low, mid, high)
+    return arr
+
+
+def merge(arr, low, mid, high):
+    left_size = mid - low + 1
+    right_size = high - mid
+
+    # copies even where slicing only makes a view (numpy, memoryview)
+    left_arr = scratch(arr, low, mid+1)
+    right_arr = scratch(arr, mid+1, high+1)
+
+    i = j = 0
+    k = low
+
+    while i < left_size and j < right_size:
+        if left_arr[i] <= right_arr[j]:
+            arr[k] = left_arr[i]
+            i += 1
+        else:
+            arr[k] = right_arr[j]
+            j += 1
+        k += 1
+
+    while i < left_size:
+        arr[k] = left_arr[i]
+        i += 1
+        k += 1
+
+    while j < right_size:
+        arr[k] = right_arr[j]
+        j += 1
+        k += 1
+
+
+def extend_run(arr, start, end, sorted_end):
+    """
+    Insertion sort on arr[start:end] where arr[start:sorted_end] is already
+    sorted. Used to extend short runs up to MIN_RUN.
+    """
+    binary_insertion_sort_range(arr, start, end - 1, sorted_end)
+
+
+def find_runs(arr, low, high, min_run=MIN_RUN):
+    """
+    Splits arr[low..high] into sorted runs and returns their start indices
+    (plus high + 1 as the final boundary).
+    Ascending stretches are kept as-is, strictly descending ones are reversed
+    (strict so equal keys keep their order), and anything shorter than
+    min_run is topped up with insertion sort.
+    """
+    bounds = array("q", [low])  # unboxed: there can be n / min_run of them
+    start = low
+    end = high + 1
+    while start < end:
+        i = start + 1
+        if i < end:
+            if arr[i] < arr[start]:
+                while i + 1 < end and arr[i + 1] < arr[i]:
+                    i += 1
+                arr[start:i + 1] = arr[start:i + 1][::-1]
+            else:
+                while i + 1 < end and arr[i + 1] >= arr[i]:
+                    i += 1
+            i += 1
+        run_end = i
+        if run_end - start < min_run:
+            forced = min(start + min_run, end)
+            extend_run(arr, start, forced, run_end)
+            run_end = forced
+        bounds.append(run_end)
+        start = run_end
+    return bounds
+
+
+def copy_range(src, dst, lo, hi, to=None):
+    """dst[to:to + hi - lo] = src[lo:hi], in COPY_CHUNK pieces (to defaults to lo)."""
+    shift = (lo if to is None else to) - lo
+    for start in range(lo, hi, COPY_CHUNK):
+        stop = min(start + COPY_CHUNK, hi)
+        dst[start + shift:stop + shift] = src[start:stop]
+
+
+def merge_runs(src, dst, lo, mid, hi, src_off=0, dst_off=0):
+    """
+    Merges src[lo:mid] and src[mid:hi] into dst[lo:hi], where position p
+    sits at index p - src_off in src and p - dst_off in dst.
+    """
+    lo, mid, hi, k = lo - src_off, mid - src_off, hi - src_off, lo - dst_off
+    # Already in order: a straight copy is enough.
+    if src[mid - 1] <= src[mid]:
+        copy_range(src, dst, lo, hi, k)
+        return
+
+    i, j = lo, mid
+    while i < mid and j < hi:
+        if src[i] <= src[j]:
+            dst[k] = src[i]
+            i += 1
+        else:
+            dst[k] = src[j]
+            j += 1
+        k += 1
+
+    if i < mid:
+        copy_range(src, dst, i, mid, k)
+    elif j < hi:
+        copy_range(src, dst, j, hi, k)
+
+
+def merge_sort_bottom_up(arr, low=0, high=None, min_run=MIN_RUN):
+    """
+    Iterative merge sort: detect natural runs, then merge neighbouring runs
+    pass by pass, ping-ponging between arr and a single preallocated buffer.
+    No recursion, and one allocation for the whole sort, the size of the
+    arr[low..high] window being sorted.
+    """
+    if high is None:
+        high = len(arr) - 1
+    if low >= high:
+        return arr
+
+    bounds = find_runs(arr, low, high, min_run)
+    if len(bounds) <= 2:
+        return arr
+
+    # holds arr[low..high] only (aux[p - low] is position p), and is of the
+    # same kind as arr (counting.CountingList sees its writes, typed buffers
+    # stay unboxed). It starts out as a copy of that window, so with an odd
+    # number of passes the first one can merge aux -> arr and the last pass
+    # still ends in arr: no copy back, which as one list slice assignment
+    # would allocate a second buffer of the same size.
+    aux = scratch(arr, low, high + 1)
+    passes = 0
+    runs = len(bounds) - 1
+    while runs > 1:
+        runs = (runs + 1) // 2
+        passes += 1
+    (src, so), (dst, do) = ((aux, low), (arr, 0)) if passes % 2 else ((arr, 0), (aux, low))
+
+    while len(bounds) > 2:
+        merged = array("q", [bounds[0]])
+        for r in range(0, len(bounds) - 2, 2):
+            merge_runs(src, dst, bounds[r], bounds[r + 1], bounds[r + 2], so, do)
+            merged.append(bounds[r + 2])
+        if (len(bounds) - 1) % 2 == 1:
+            # odd run out: carry it across unchanged
+            copy_range(src, dst, bounds[-2] - so, bounds[-1] - so, bounds[-2] - do)
+            merged.append(bounds[-1])
+        bounds = merged
+        (src, so), (dst, do) = (dst, do), (src, so)
+    return arr
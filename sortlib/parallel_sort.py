@@ -0,0 +1,188 @@
+"""
+Merge sort spread over worker processes.
+
+The keys are copied once into a multiprocessing.shared_memory buffer of
+int64. Each worker attaches to it by name, sorts one contiguous chunk with
+an ordinary sortlib sort and writes it back, so no data is pickled. The
+sorted chunks are then merged in parallel too: every chunk is cut into p
+slices at the keys of global rank n/p, 2n/p, ... (found by bisecting on
+the key value), with runs of equal keys shared out by rank, so worker j
+heap-merges exactly its n/p keys, the j-th slice of every chunk, straight
+into its own range of a second shared buffer, however many duplicates
+there are. Only the final copy back into arr runs in one process.
+
+numpy is only used to view the shared buffers and is imported lazily.
+"""
+
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+from sortlib.batch import as_int64, int64_keys
+from sortlib.bench.parallel import _pin_worker, available_cpus
+from sortlib.buffers import write_back
+from sortlib.registry import get
+
+# Below this many keys the process start-up costs more than it saves.
+PARALLEL_MIN_N = 50_000
+
+
+def _view(shm, n):
+    import numpy as np
+
+    return np.ndarray((n,), dtype=np.int64, buffer=shm.buf)
+
+
+def _sort_chunk(name, n, lo, hi, kernel):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        view = _view(shm, n)
+        view[lo:hi] = get(kernel)(view[lo:hi].tolist())
+        del view
+    finally:
+        shm.close()
+
+
+def _merge_slices(src_name, dst_name, n, slices, out_lo):
+    src = shared_memory.SharedMemory(name=src_name)
+    dst = shared_memory.SharedMemory(name=dst_name)
+    try:
+        s, d = _view(src, n), _view(dst, n)
+        runs = [s[a:b].tolist() for a, b in slices if a < b]
+        merged = list(heapq.merge(*runs))
+        d[out_lo:out_lo + len(merged)] = merged
+        del s, d
+    finally:
+        src.close()
+        dst.close()
+
+
+def _bounds(n, parts):
+    step, extra = divmod(n, parts)
+    out = [0]
+    for i in range(parts):
+        out.append(out[-1] + step + (i < extra))
+    return out
+
+
+def _rank_cut(chunks, rank):
+    """
+    How many keys of each sorted chunk are among the rank smallest of all
+    of them. Equal keys are taken in chunk order, as the merge outputs them.
+    """
+    lo = min(int(c[0]) for c in chunks if len(c))
+    hi = max(int(c[-1]) for c in chunks if len(c))
+    # smallest key with more than rank keys <= it: the one at global rank
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if sum(int(c.searchsorted(mid, side="right")) for c in chunks) > rank:
+            hi = mid
+        else:
+            lo = mid + 1
+    below = [int(c.searchsorted(lo, side="left")) for c in chunks]
+    need = rank - sum(below)
+    cut = []
+    for c, b in zip(chunks, below):
+        take = min(need, int(c.searchsorted(lo, side="right")) - b)
+        cut.append(b + take)
+        need -= take
+    return cut
+
+
+def _split_plan(view, bounds, parts):
+    """
+    Per output part, the (start, end) slice of every sorted chunk that goes
+    into it, plus the part's offset in the output. Part j gets the keys of
+    global rank _bounds(n, parts)[j] up to the next one.
+    """
+    chunks = [view[lo:hi] for lo, hi in zip(bounds, bounds[1:])]
+    ranks = _bounds(bounds[-1], parts)
+    cuts = ([[0] * len(chunks)] + [_rank_cut(chunks, r) for r in ranks[1:-1]]
+            + [[len(c) for c in chunks]])
+
+    plan = []
+    for j in range(parts):
+        slices = [(lo + cuts[j][i], lo + cuts[j + 1][i]) for i, lo in enumerate(bounds[:-1])]
+        plan.append((slices, ranks[j]))
+    return plan
+
+
+def parallel_merge_sort(arr, workers=None, kernel="merge", pin=True):
+    """
+    Sorts the integers in arr (list or typed buffer, values within int64) in
+    place and returns arr. Chunks are sorted by the registered sort named
+    kernel in `workers` processes (default: one per available CPU), then
+    merged in parallel. Small inputs or workers=1 just run kernel here.
+    Raises TypeError for non-integer keys and ValueError outside int64.
+    """
+    keys = int64_keys(arr)
+    n = len(arr)
+    cpus = available_cpus()
+    workers = min(workers or len(cpus), max(1, n // 2))
+    if workers <= 1 or n < PARALLEL_MIN_N:
+        result = get(kernel)(list(arr))
+        if isinstance(arr, list):
+            arr[:] = result
+        else:
+            write_back(arr, 0, as_int64(result))
+        return arr
+
+    src = shared_memory.SharedMemory(create=True, size=keys.nbytes)
+    dst = shared_memory.SharedMemory(create=True, size=keys.nbytes)
+    try:
+        view = _view(src, n)
+        view[:] = keys
+        bounds = _bounds(n, workers)
+
+        initializer = initargs = None
+        if pin:
+            cpu_queue = mp.Queue()
+            for i in range(workers):
+                cpu_queue.put(cpus[i % len(cpus)])
+            initializer, initargs = _pin_worker, (cpu_queue,)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                                 initargs=initargs or ()) as pool:
+            for fut in [pool.submit(_sort_chunk, src.name, n, lo, hi, kernel)
+                        for lo, hi in zip(bounds, bounds[1:])]:
+                fut.result()
+            plan = _split_plan(view, bounds, workers)
+            for fut in [pool.submit(_merge_slices, src.name, dst.name, n, slices, out_lo)
+                        for slices, out_lo in plan]:
+                fut.result()
+
+        out = _view(dst, n)
+        write_back(arr, 0, out)
+        del view, out
+    finally:
+        for shm in (src, dst):
+            shm.close()
+            shm.unlink()
+    return arr
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from sortlib.merge import merge_sort
+
+    n = 2_000_000
+    rng = random.Random(338)
+    data = [rng.randrange(10 * n) for _ in range(n)]
+
+    t0 = time.perf_counter()
+    merge_sort(data[:])
+    base = time.perf_counter() - t0
+    print(f"merge_sort, 1 process: {base:.2f}s")
+
+    counts = sorted({1, 2, 4, 8, len(available_cpus())})
+    for workers in counts:
+        a = data[:]
+        t0 = time.perf_counter()
+        parallel_merge_sort(a, workers=workers)
+        t = time.perf_counter() - t0
+        print(f"parallel_merge_sort, {workers:2d} workers: {t:.2f}s  speedup {base / t:.2f}x"
+              f"  (cpus available: {os.cpu_count()})")
@@ -0,0 +1,170 @@
+import math
+
+# Ranges this small are finished with insertion sort.
+INSERTION_CUTOFF = 16
+# From this size on the pivot is a ninther (median of three medians).
+NINTHER_THRESHOLD = 128
+
+
+def insertion_sort_range(arr, low, high):
+    """Insertion sort on arr[low..high] (inclusive)."""
+    for i in range(low + 1, high + 1):
+        key = arr[i]
+        j = i - 1
+        while j >= low and arr[j] > key:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = key
+
+
+def sort3(arr, a, b, c):
+    """Orders arr[a] <= arr[b] <= arr[c] with at most three swaps."""
+    if arr[b] < arr[a]:
+        arr[a], arr[b] = arr[b], arr[a]
+    if arr[c] < arr[b]:
+        arr[b], arr[c] = arr[c], arr[b]
+        if arr[b] < arr[a]:
+            arr[a], arr[b] = arr[b], arr[a]
+
+
+def choose_pivot(arr, low, high):
+    """
+    Moves a median-of-three (or ninther for large ranges) pivot to arr[low].
+    Returns True if the sample contained equal keys, which is used as a cheap
+    hint that the range is duplicate-heavy.
+    """
+    size = high - low + 1
+    mid = low + size // 2
+    if size >= NINTHER_THRESHOLD:
+        s = size // 8
+        sort3(arr, low, low + s, low + 2 * s)
+        sort3(arr, mid - s, mid, mid + s)
+        sort3(arr, high - 2 * s, high - s, high)
+        sort3(arr, low + s, mid, high - s)
+        dup = (arr[low] == arr[low + s] or arr[low + s] == arr[low + 2 * s]
+               or arr[mid - s] == arr[mid] or arr[mid] == arr[mid + s]
+               or arr[high - 2 * s] == arr[high - s] or arr[high - s] == arr[high])
+    else:
+        sort3(arr, low, mid, high)
+        dup = arr[low] == arr[mid] or arr[mid] == arr[high]
+    arr[low], arr[mid] = arr[mid], arr[low]
+    return dup
+
+
+def hoare_partition(arr, low, high):
+    """
+    Hoare partition around the pivot stored at arr[low].
+    Returns j such that arr[low..j] <= pivot <= arr[j+1..high], low <= j < high.
+    """
+    pivot = arr[low]
+    i = low - 1
+    j = high + 1
+    while True:
+        i += 1
+        while arr[i] < pivot:
+            i += 1
+        j -= 1
+        while arr[j] > pivot:
+            j -= 1
+        if i >= j:
+            return j
+        arr[i], arr[j] = arr[j], arr[i]
+
+
+def three_way_partition(arr, low, high):
+    """
+    Dutch national flag partition around the pivot stored at arr[low].
+    Returns (lt, gt) such that arr[low..lt-1] < pivot, arr[lt..gt] == pivot
+    and arr[gt+1..high] > pivot.
+    """
+    pivot = arr[low]
+    lt = low
+    gt = high
+    i = low + 1
+    while i <= gt:
+        v = arr[i]
+        if v < pivot:
+            arr[lt], arr[i] = v, arr[lt]
+            lt += 1
+            i += 1
+        elif v > pivot:
+            arr[gt], arr[i] = v, arr[gt]
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+
+def sift_down(arr, low, root, end):
+    """Max-heap sift-down for a heap stored in arr[low..end-1]."""
+    item = arr[root]
+    while True:
+        child = 2 * (root - low) + 1 + low
+        if child >= end:
+            break
+        if child + 1 < end and arr[child] < arr[child + 1]:
+            child += 1
+        if not item < arr[child]:
+            break
+        arr[root] = arr[child]
+        root = child
+    arr[root] = item
+
+
+def heapsort(arr, low=0, high=None):
+    """In-place heapsort of arr[low..high]. Worst case O(n log n)."""
+    if high is None:
+        high = len(arr) - 1
+    end = high + 1
+    size = end - low
+    for root in range(low + size // 2 - 1, low - 1, -1):
+        sift_down(arr, low, root, end)
+    for last in range(high, low, -1):
+        arr[low], arr[last] = arr[last], arr[low]
+        sift_down(arr, low, low, last)
+    return arr
+
+
+def quicksort(arr, low=0, high=None, three_way=None):
+    """
+    Introsort: quicksort with median-of-three / ninther pivots and Hoare
+    partitioning, falling back to heapsort once the depth passes
+    2*log2(n) so sorted, reversed or adversarial inputs stay O(n log n).
+
+    three_way=None picks Dutch flag partitioning only when the pivot sample
+    shows duplicates; True/False forces it on/off.
+    Only the smaller side is recursed on, so the stack stays O(log n).
+    """
+    if high is None:
+        high = len(arr) - 1
+    if high - low < 1:
+        return arr
+    depth_limit = 2 * int(math.log2(high - low + 1))
+    _introsort(arr, low, high, depth_limit, three_way)
+    return arr
+
+
+def _introsort(arr, low, high, depth_limit, three_way):
+    while high - low + 1 > INSERTION_CUTOFF:
+        if depth_limit == 0:
+            heapsort(arr, low, high)
+            return
+        depth_limit -= 1
+
+        dup = choose_pivot(arr, low, high)
+        if three_way or (three_way is None and dup):
+            lt, gt = three_way_partition(arr, low, high)
+            left_high, right_low = lt - 1, gt + 1
+        else:
+            j = hoare_partition(arr, low, high)
+            left_high, right_low = j, j + 1
+
+        # recurse into the smaller side, loop on the larger one
+        if left_high - low < high - right_low:
+            _introsort(arr, low, left_high, depth_limit, three_way)
+            low = right_low
+        else:
+            _introsort(arr, right_low, high, depth_limit, three_way)
+            high = left_high
+
+    insertion_sort_range(arr, low, high)
@@ -0,0 +1,114 @@
+"""
+Non-comparison sorts for integer keys.
+
+Both take the same (arr, low=0, high=None) arguments as merge_sort and
+quicksort, sort arr[low..high] in place and return arr. arr may be a list
+of ints or an integer typed buffer (array.array, numpy array or
+memoryview, see sortlib.buffers). Anything else raises TypeError rather
+than being truncated to ints.
+
+counting_sort is O(n + k) time and O(k) memory for a key range of k, so it
+only suits small ranges: a range wider than COUNTING_MAX_SPAN_RATIO * n
+(and than COUNTING_MIN_SPAN) is handed to radix_sort instead. Both raise
+ValueError for keys outside int64. radix_sort is an LSD radix sort over 8-bit digits
+of (key - min), vectorized with numpy: one pass per byte of the range,
+passes whose digit is the same for every key are skipped, and extra memory
+is a few n-sized int64 arrays whatever the range. numpy is imported inside
+the functions that need it.
+"""
+
+from sortlib.buffers import as_numpy, is_typed, write_back
+
+RADIX_BITS = 8
+# counting_sort's count array may be this many times longer than the input
+# (matches the widest ratio sortlib.bench.calibrate tries), or up to
+# COUNTING_MIN_SPAN entries for small inputs, before radix_sort takes over.
+COUNTING_MAX_SPAN_RATIO = 16
+COUNTING_MIN_SPAN = 1 << 16
+
+
+def _too_wide(span, n):
+    return span >= max(COUNTING_MAX_SPAN_RATIO * n, COUNTING_MIN_SPAN)
+
+
+def counting_sort(arr, low=0, high=None):
+    """
+    Sorts the integers in arr[low..high] by counting occurrences of each
+    value, or with radix_sort when their range is too wide to count.
+    """
+    if high is None:
+        high = len(arr) - 1
+    if low >= high:
+        return arr
+
+    if is_typed(arr):
+        import numpy as np
+
+        from sortlib.batch import int64_keys
+
+        view = as_numpy(arr)
+        vals = int64_keys(view[low:high + 1])
+        lo, hi = int(vals.min()), int(vals.max())
+        if _too_wide(hi - lo, len(vals)):
+            return radix_sort(arr, low, high)
+        counts = np.bincount(vals - lo)
+        view[low:high + 1] = np.repeat(np.arange(len(counts), dtype=view.dtype) + lo, counts)
+        return arr
+
+    vals = arr[low:high + 1]
+    if not all(isinstance(v, int) for v in vals):
+        raise TypeError("counting_sort needs integer keys")
+    lo, hi = min(vals), max(vals)
+    if lo < -2**63 or hi >= 2**63:
+        raise ValueError("integer keys must fit in int64")
+    if _too_wide(hi - lo, len(vals)):
+        return radix_sort(arr, low, high)
+    counts = [0] * (hi - lo + 1)
+    for v in vals:
+        counts[v - lo] += 1
+    k = low
+    for offset, c in enumerate(counts):
+        if c:
+            arr[k:k + c] = [lo + offset] * c
+            k += c
+    return arr
+
+
+def radix_sort(arr, low=0, high=None):
+    """
+    Sorts the integers in arr[low..high] with an LSD radix sort, one numpy
+    histogram + stable scatter per 8-bit digit. Raises TypeError for
+    non-integer keys and ValueError for keys outside int64.
+    """
+    if high is None:
+        high = len(arr) - 1
+    if low >= high:
+        return arr
+
+    import numpy as np
+
+    from sortlib.batch import int64_keys
+
+    keys = int64_keys(arr[low:high + 1])
+    lo = int(keys.min())
+    span = int(keys.max()) - lo
+    # work on key - min as uint64; the subtraction wraps mod 2^64, which is
+    # exact because span < 2^64
+    base = np.uint64(lo % 2**64)
+    u = keys.astype(np.uint64)
+    u -= base
+
+    mask = np.uint64((1 << RADIX_BITS) - 1)
+    n = len(u)
+    for p in range((span.bit_length() + RADIX_BITS - 1) // RADIX_BITS):
+        digits = ((u >> np.uint64(p * RADIX_BITS)) & mask).astype(np.uint8)
+        counts = np.bincount(digits, minlength=1 << RADIX_BITS)
+        if counts.max() == n:
+            continue  # every key has the same digit here
+        # a stable sort of 8-bit digits is numpy's own counting/radix
+        # scatter, i.e. the prefix sum of counts applied in one call
+        u = u[np.argsort(digits, kind="stable")]
+
+    u += base
+    write_back(arr, low, u.view(np.int64))
+    return arr
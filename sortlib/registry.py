@@ -0,0 +1,105 @@
+"""
+Name -> algorithm lookup with capability metadata.
+
+Entries point at "module:function" strings and are only imported the first
+time they are looked up, so listing or filtering algorithms never imports
+anything. Modules that need numpy/matplotlib import them inside functions.
+
+Calling conventions:
+  sort    fn(arr) -> sorted list (in_place ones sort arr and return it)
+  search  fn(arr, target) -> bool (requires_sorted ones need sorted arr)
+  batch   fn(arr, targets) -> (found, positions) numpy arrays
+
+ints_only sorts take integer keys only (int64 for the numpy-backed ones)
+and raise TypeError on anything else; generic sweeps over mixed inputs
+should use names("sort", ints_only=False).
+"""
+
+import importlib
+
+REGISTRY = {}
+
+
+def register(name, target, kind, stable=False, in_place=False,
+             requires_sorted=False, ints_only=False, counter=None):
+    """
+    Adds an algorithm. counter is an optional "module:function" returning
+    (result, comparisons, swaps) for the same input.
+    """
+    if kind not in ("sort", "search", "batch"):
+        raise ValueError(f"unknown kind {kind!r}")
+    REGISTRY[name] = {
+        "name": name,
+        "target": target,
+        "kind": kind,
+        "stable": stable,
+        "in_place": in_place,
+        "requires_sorted": requires_sorted,
+        "ints_only": ints_only,
+        "counter": counter,
+    }
+
+
+def _resolve(target):
+    module, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def info(name):
+    """Metadata dict for name (without importing the algorithm)."""
+    try:
+        return REGISTRY[name]
+    except KeyError:
+        raise KeyError(f"unknown algorithm {name!r}; known: {sorted(REGISTRY)}") from None
+
+
+def get(name):
+    """The callable registered under name."""
+    return _resolve(info(name)["target"])
+
+
+def get_counter(name):
+    """The counting variant of name, or None if it has none."""
+    counter = info(name)["counter"]
+    return _resolve(counter) if counter else None
+
+
+def names(kind=None, **caps):
+    """Registered names, optionally filtered by kind and metadata, e.g. stable=True."""
+    out = []
+    for name, meta in REGISTRY.items():
+        if kind is not None and meta["kind"] != kind:
+            continue
+        if any(meta.get(k) != v for k, v in caps.items()):
+            continue
+        out.append(name)
+    return out
+
+
+register("merge", "sortlib.merge:merge_sort", "sort", stable=True, in_place=True)
+register("merge_recursive", "sortlib.merge:merge_sort_recursive", "sort",
+         stable=True, in_place=True)
+register("quick", "sortlib.quick:quicksort", "sort", in_place=True)
+register("heap", "sortlib.quick:heapsort", "sort", in_place=True)
+register("hybrid", "sortlib.hybrid:hybrid_sort", "sort", in_place=True)
+register("radix", "sortlib.radix:radix_sort", "sort", stable=True, in_place=True,
+         ints_only=True)
+register("counting", "sortlib.radix:counting_sort", "sort", stable=True, in_place=True,
+         ints_only=True)
+register("parallel_merge", "sortlib.parallel_sort:parallel_merge_sort", "sort",
+         stable=True, in_place=True, ints_only=True)
+register("bubble", "sortlib.simple:bubble_sort", "sort", stable=True, in_place=True,
+         counter="sortlib.simple:bubble_sort_with_counts")
+register("insertion", "sortlib.simple:insertion_sort", "sort", stable=True, in_place=True)
+register("binary_insertion", "sortlib.simple:binary_insertion_sort", "sort", in_place=True)
+register("block_insertion", "sortlib.simple:block_insertion_sort", "sort", stable=True,
+         in_place=True)
+
+register("linear", "sortlib.search:linear_search", "search")
+register("binary", "sortlib.search:binary_search", "search", requires_sorted=True)
+register("first_mid", "sortlib.search:binary_search_first_mid", "search",
+         requires_sorted=True)
+
+register("batch_binary", "sortlib.batch:batch_binary_search", "batch",
+         requires_sorted=True)
+register("batch_linear", "sortlib.batch:batch_linear_search", "batch")
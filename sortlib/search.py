@@ -0,0 +1,141 @@
+def linear_search(arr, target):
+    for v in arr:
+        if v == target:
+            return True
+    return False
+
+
+def binary_search(arr, target):
+    """Membership test on a sorted list."""
+    lo, hi = 0, len(arr) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if arr[mid] == target:
+            return True
+        if arr[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return False
+
+
+def lower_bound(a, key, low=0, high=None):
+    """First index in a[low:high] whose value is >= key (insertion point)."""
+    if high is None:
+        high = len(a)
+    while low < high:
+        mid = (low + high) // 2
+        if a[mid] < key:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+
+def binary_search_first_mid(arr, target, first_mid_index=None):
+    """
+    Returns True/False. First iteration uses first_mid_index as the midpoint.
+    All later iterations use standard midpoint splitting.
+    """
+    n = len(arr)
+    if n == 0:
+        return False
+
+    if first_mid_index is None:
+        first_mid_index = (n - 1) // 2
+
+    # clamp the first mid into range
+    mid = max(0, min(n - 1, first_mid_index))
+
+    lo, hi = 0, n - 1
+
+    # first probe
+    if arr[mid] == target:
+        return True
+    elif arr[mid] < target:
+        lo = mid + 1
+    else:
+        hi = mid - 1
+
+    # standard binary search after the first step
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if arr[mid] == target:
+            return True
+        elif arr[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+
+    return False
+
+
+def binary_search_probes(arr, target, first_mid_index=None, low=0, high=None):
+    """
+    Same search as binary_search_first_mid (optionally restricted to
+    arr[low..high]), but returns (found, probes) where probes is the number
+    of array elements compared against target.
+    """
+    if high is None:
+        high = len(arr) - 1
+    if low > high:
+        return False, 0
+
+    if first_mid_index is None:
+        first_mid_index = (low + high) // 2
+    mid = max(low, min(high, first_mid_index))
+
+    lo, hi = low, high
+    probes = 0
+    while lo <= hi:
+        probes += 1
+        if arr[mid] == target:
+            return True, probes
+        elif arr[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+        mid = (lo + hi) // 2
+
+    return False, probes
+
+
+def gallop_right(a, key, hint, low=0, high=None):
+    """
+    First index in a[low:high] whose value is > key (the stable insertion
+    point), found by galloping out from hint in steps of 1, 2, 4, ... and
+    then binary searching the last step. Takes O(log d) comparisons when the
+    answer is d places from hint, so nearly-sorted input is cheap.
+    """
+    if high is None:
+        high = len(a)
+    if low >= high:
+        return low
+    hint = max(low, min(high - 1, hint))
+
+    if a[hint] <= key:
+        # answer in (hint, high]
+        last, step = hint, 1
+        probe = hint + 1
+        while probe < high and a[probe] <= key:
+            last = probe
+            step *= 2
+            probe = hint + step
+        lo, hi = last + 1, min(probe, high)
+    else:
+        # answer in [low, hint]
+        first, step = hint, 1
+        probe = hint - 1
+        while probe >= low and key < a[probe]:
+            first = probe
+            step *= 2
+            probe = hint - step
+        lo, hi = max(probe + 1, low), first
+
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if key < a[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
@@ -0,0 +1,172 @@
+"""
+Local lookup service over a sorted table, with micro-batching.
+
+SearchService keeps one sorted int table in memory. Lookups that arrive
+within max_delay seconds of each other, up to max_batch of them, are
+answered together by a single batch_binary_search call instead of one
+Python-level search each. serve() puts the service behind a TCP or Unix
+socket with a line protocol: the client sends one integer per line and
+gets back "<found 0/1> <insertion point>" per line, in order, or "error"
+for a line that is not an int64 (or a lookup that failed).
+
+load_test() is the matching load generator: it opens `concurrency`
+connections, replays a list of targets over them and reports p50/p99
+latency and throughput. `python -m sortlib.service [data.json]` runs both
+against Ex7's task file.
+"""
+
+import asyncio
+import operator
+import statistics
+import time
+
+from sortlib.batch import batch_binary_search, int64_keys
+
+# Longest a lookup waits for others to share its batch (seconds). Lookups
+# that arrive in the same event-loop pass are batched even at 0; 300us
+# measured slower than 50us with 64 clients on one core.
+MAX_DELAY = 50e-6
+MAX_BATCH = 1024
+
+
+class SearchService:
+    def __init__(self, table, max_delay=MAX_DELAY, max_batch=MAX_BATCH):
+        self.table = int64_keys(table)
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.batches = 0
+        self.lookups = 0
+        self._pending = []
+        self._timer = None
+
+    def lookup(self, target):
+        """
+        Future resolving to (found, insertion point) for target. Raises
+        TypeError for a non-integer target and ValueError for one outside
+        int64, which the table cannot hold.
+        """
+        target = operator.index(target)
+        if not -2**63 <= target < 2**63:
+            raise ValueError(f"target {target} is outside int64")
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((target, fut))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush)
+        return fut
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            found, positions = batch_binary_search(self.table, [t for t, _ in pending])
+        except Exception as exc:
+            # fail the whole batch rather than leave its waiters hanging
+            for _, fut in pending:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        for (_, fut), f, p in zip(pending, found.tolist(), positions.tolist()):
+            if not fut.done():
+                fut.set_result((f, p))
+        self.batches += 1
+        self.lookups += len(pending)
+
+    async def handle(self, reader, writer):
+        """Serves one connection: a target per line in, a result per line out."""
+        try:
+            while line := await reader.readline():
+                try:
+                    found, pos = await self.lookup(int(line))
+                except Exception:
+                    # not an int, outside int64, or the batch failed
+                    writer.write(b"error\n")
+                else:
+                    writer.write(b"%d %d\n" % (found, pos))
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(service, host="127.0.0.1", port=0, path=None):
+    """Starts an asyncio server for service on a Unix socket path or TCP host:port."""
+    if path is not None:
+        return await asyncio.start_unix_server(service.handle, path=path)
+    return await asyncio.start_server(service.handle, host, port)
+
+
+async def _open(host, port, path):
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def load_test(targets, host="127.0.0.1", port=None, path=None, concurrency=64,
+                    rounds=1):
+    """
+    Replays targets `rounds` times over `concurrency` connections, each
+    sending one request at a time. Returns {"requests", "qps", "p50_us",
+    "p99_us", "hits"}.
+    """
+    work = [t for _ in range(rounds) for t in targets]
+    latencies = []
+    hits = 0
+
+    async def client(share):
+        nonlocal hits
+        reader, writer = await _open(host, port, path)
+        for t in share:
+            t0 = time.perf_counter()
+            writer.write(b"%d\n" % t)
+            reply = await reader.readline()
+            latencies.append(time.perf_counter() - t0)
+            hits += reply.startswith(b"1")
+        writer.close()
+        await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(work[i::concurrency]) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    pct = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "qps": len(latencies) / elapsed,
+        "p50_us": statistics.median(latencies) * 1e6,
+        "p99_us": pct[98] * 1e6,
+        "hits": hits,
+    }
+
+
+async def _demo(table, targets):
+    for max_batch in (1, MAX_BATCH):
+        service = SearchService(table, max_batch=max_batch)
+        server = await serve(service)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            stats = await load_test(targets, port=port, rounds=20)
+        print(f"max_batch={max_batch:5d}: {stats['qps']:9.0f} req/s  "
+              f"p50={stats['p50_us']:7.0f}us  p99={stats['p99_us']:7.0f}us  "
+              f"avg batch={service.lookups / max(service.batches, 1):.1f}  "
+              f"hits={stats['hits']}")
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import sys
+
+    from sortlib.loader import iter_json_ints, sorted_keys
+
+    ex7 = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Ex7")
+    if len(sys.argv) > 1:
+        table = sorted_keys(sys.argv[1])
+    else:
+        table = sorted(random.Random(338).sample(range(10**6), 100_000))
+    targets = list(iter_json_ints(os.path.join(ex7, "ex7tasks.json")))
+    asyncio.run(_demo(table, targets))
@@ -0,0 +1,101 @@
+from bisect import bisect_right
+
+from sortlib.buffers import copy_of
+from sortlib.search import gallop_right, lower_bound
+
+
+def bubble_sort(arr):
+    """In-place bubble sort (no early exit), as timed in Ex2."""
+    n = len(arr)
+    for i in range(n):
+        for j in range(0, n-i-1):
+            if arr[j] > arr[j+1]:
+                temp = arr[j]
+                arr[j] = arr[j+1]
+                arr[j+1] = temp
+    return arr
+
+
+def bubble_sort_with_counts(arr, copy=False):
+    """Bubble sort that counts comparisons and swaps (sorts a copy of arr if copy)"""
+    n = len(arr)
+    comparisons = 0
+    swaps = 0
+
+    arr_copy = copy_of(arr) if copy else arr
+
+    for i in range(n):
+        for j in range(0, n-i-1):
+            comparisons += 1
+            if arr_copy[j] > arr_copy[j+1]:
+                arr_copy[j], arr_copy[j+1] = arr_copy[j+1], arr_copy[j]
+                swaps += 1
+
+    return arr_copy, comparisons, swaps
+
+
+def insertion_sort(arr, copy=False):
+    """Sorts arr in place (element-by-element shifting) and returns it; copy=True sorts a copy instead."""
+    a = copy_of(arr) if copy else arr
+    for i in range(1, len(a)):
+        key = a[i]
+        j = i - 1
+        while j >= 0 and a[j] > key:
+            a[j + 1] = a[j]
+            j -= 1
+        a[j + 1] = key
+    return a
+
+
+def binary_insertion_sort(arr, copy=False):
+    """Sorts arr in place, finding each insert point by binary search, and returns it; copy=True sorts a copy instead."""
+    a = copy_of(arr) if copy else arr
+    for i in range(1, len(a)):
+        key = a[i]
+        pos = lower_bound(a, key, 0, i)
+        a[pos+1:i+1] = a[pos:i]
+        a[pos] = key
+    return a
+
+
+def binary_insertion_sort_range(a, low, high, sorted_end=None, gallop=False):
+    """
+    Stable in-place binary insertion sort of a[low..high] (inclusive), where
+    a[low:sorted_end] is already sorted (default: just a[low]).
+
+    Works on lists, array.array, numpy arrays and memoryviews. Elements already in place
+    cost one comparison; the others are placed with bisect (C) or, with
+    gallop=True, by galloping out from the previous insert point, which
+    needs fewer comparisons on nearly-sorted input but runs in Python. The
+    block in front of the insert point moves with one slice assignment (a
+    memmove for array.array/numpy, a C-level copy for lists) instead of one
+    Python-level step per element. merge_sort extends its short runs with it.
+    """
+    if sorted_end is None:
+        sorted_end = low + 1
+    pos = low
+    for i in range(max(sorted_end, low + 1), high + 1):
+        key = a[i]
+        if not key < a[i - 1]:
+            pos = i
+            continue
+        # key < a[i - 1], so the insert point is at most i - 1
+        if gallop:
+            pos = gallop_right(a, key, pos, low, i - 1)
+        else:
+            pos = bisect_right(a, key, low, i - 1)
+        a[pos + 1:i + 1] = a[pos:i]
+        a[pos] = key
+
+
+def block_insertion_sort(arr, gallop=False, copy=False):
+    """
+    Sorts arr (list or any sortlib.buffers typed buffer) in place with
+    binary_insertion_sort_range and returns it; copy=True sorts a copy
+    instead. Unlike
+    binary_insertion_sort it is stable and shifts whole blocks at once.
+    """
+    a = copy_of(arr) if copy else arr
+    if len(a) > 1:
+        binary_insertion_sort_range(a, 0, len(a) - 1, gallop=gallop)
+    return a